@@ -0,0 +1,248 @@
+""" 거래소별 장 마감 후 모든 종목의 일봉 캐시를 갱신하는 배치 작업 """
+
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from datetime import date, datetime, time as clock, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from kis.get import StockExchange, exchange_list, resolve_exchange
+from kis.loader import UniverseLoader
+from system.logger import log
+
+# 체크포인트와 실행 결과를 저장하는 디렉토리
+BATCH_DIR = Path(
+    os.environ.get("IVOT_BATCH_DIR", Path.home() / ".cache" / "ivot" / "batch")
+)
+
+# 거래소코드 -> (현지 시간대, 정규장 마감 시각)
+closing_times: Dict[str, Tuple[ZoneInfo, clock]] = {
+    "KRX": (ZoneInfo("Asia/Seoul"), clock(15, 30)),
+    "HKS": (ZoneInfo("Asia/Hong_Kong"), clock(16, 0)),
+    "NYS": (ZoneInfo("America/New_York"), clock(16, 0)),
+    "NAS": (ZoneInfo("America/New_York"), clock(16, 0)),
+    "AMS": (ZoneInfo("America/New_York"), clock(16, 0)),
+    "TSE": (ZoneInfo("Asia/Tokyo"), clock(15, 30)),
+    "SHS": (ZoneInfo("Asia/Shanghai"), clock(15, 0)),
+    "SZS": (ZoneInfo("Asia/Shanghai"), clock(15, 0)),
+    "HSX": (ZoneInfo("Asia/Ho_Chi_Minh"), clock(15, 0)),
+    "HNX": (ZoneInfo("Asia/Ho_Chi_Minh"), clock(15, 0)),
+}
+
+
+def session_close(exchange: StockExchange, day: date) -> datetime:
+    """day(현지 날짜)의 장 마감 시각 (UTC)"""
+    zone, close = closing_times[exchange.code]
+    return datetime.combine(day, close, tzinfo=zone).astimezone(timezone.utc)
+
+
+def last_session(exchange: StockExchange, now: datetime, delay: timedelta) -> date:
+    """now 기준으로 마감 후 delay가 지난 가장 최근 거래일(현지 날짜, 평일)"""
+    zone, _ = closing_times[exchange.code]
+    day = now.astimezone(zone).date()
+    while day.weekday() >= 5 or session_close(exchange, day) + delay > now:
+        day -= timedelta(days=1)
+    return day
+
+
+class Checkpoint:
+    """
+    - root/{거래일}/{거래소코드}.done 파일에 갱신을 마친 종목코드를 한 줄씩 기록합니다.
+    - 작업이 중단되어도 다시 실행하면 기록된 종목은 건너뜁니다.
+    - 실행이 끝날 때마다 root/{거래일}/{거래소코드}.json 에 실행 결과가 기록됩니다.
+    """
+
+    def __init__(self, exchange: StockExchange, day: date, root: Path = BATCH_DIR):
+        self.dir = Path(root) / day.isoformat()
+        self.done_path = self.dir / f"{exchange.code}.done"
+        self.report_path = self.dir / f"{exchange.code}.json"
+        self._file = None
+
+    def done(self) -> Set[str]:
+        """이미 갱신한 종목코드들"""
+        try:
+            return set(self.done_path.read_text(encoding="utf-8").split())
+        except OSError:
+            return set()
+
+    def add(self, code: str):
+        if self._file is None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.done_path, "a", encoding="utf-8")
+        self._file.write(f"{code}\n")
+        self._file.flush()  # 프로세스가 죽어도 기록이 남도록 바로 내보냅니다.
+
+    def report(self) -> Optional[dict]:
+        """마지막 실행 결과 / 실행이 끝난 적이 없으면 None"""
+        try:
+            return json.loads(self.report_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def save_report(self, report: dict):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        with open(self.dir.parent / "runs.jsonl", "a", encoding="utf-8") as file:
+            file.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def refresh(
+    exchange: StockExchange,
+    day: date,
+    *,
+    workers: int = 8,
+    max_size: int = 100,
+    root: Path = BATCH_DIR,
+) -> dict:
+    """
+    - 거래소의 모든 종목의 일봉 캐시(kis.cache.history_cache)를 갱신합니다.
+    - 체크포인트에 기록된 종목은 건너뛰고, 실패한 종목은 다음 실행에서 다시 시도합니다.
+    - 실행 결과(처리량, 실패 종목 등) dict를 반환합니다.
+    """
+    checkpoint = Checkpoint(exchange, day, root)
+    attempt = (checkpoint.report() or {}).get("attempt", 0) + 1
+    done = checkpoint.done()
+    pending = [code for code in exchange.stocks.tolist() if code not in done]
+    log.info(
+        f"[batch] {exchange.code} {day} 갱신 시작 "
+        f"(대상: {len(pending)}, 완료된 종목: {len(done)})"
+    )
+
+    failed = {}
+
+    def on_error(exchange: StockExchange, code: str, error: Exception):
+        failed[code] = repr(error)
+
+    def on_progress(exchange: StockExchange, code: str, *_):
+        if code not in failed:
+            checkpoint.add(code)
+
+    loader = UniverseLoader(
+        workers=workers, max_size=max_size, on_progress=on_progress, on_error=on_error
+    )
+    started = datetime.now(timezone.utc)
+    try:
+        loader.load_symbols([(exchange, code) for code in pending])
+    finally:
+        checkpoint.close()
+        report = loader.report
+        result = {
+            "exchange": exchange.code,
+            "session": day.isoformat(),
+            "attempt": attempt,
+            "started": started.isoformat(timespec="seconds"),
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "elapsed": report.elapsed,
+            "total": len(exchange.stocks),
+            "skipped": len(done),
+            "loaded": report.loaded,
+            "failed": len(failed),
+            "throughput": report.throughput,
+            "complete": not failed and report.loaded == len(pending),
+            "errors": failed,
+        }
+        checkpoint.save_report(result)
+    log.info(
+        f"[batch] {exchange.code} {day} 갱신 완료 "
+        f"({report.loaded}/{len(pending)}, 실패: {len(failed)}, {report.throughput:.2f} symbols/s)"
+    )
+    return result
+
+
+def schedule(
+    exchanges: List[StockExchange],
+    delay: timedelta,
+    retry: timedelta = timedelta(minutes=10),
+    attempts: int = 3,
+    root: Path = BATCH_DIR,
+) -> Tuple[datetime, StockExchange, date]:
+    """
+    - 다음에 실행할 (실행 시각, 거래소, 거래일)
+    - 마감 후 delay가 지난 가장 최근 거래일이 아직 완료되지 않았으면
+        - 실행된 적이 없거나 중단되었다면 바로 실행합니다. (체크포인트부터 이어서)
+        - 실패한 종목이 있으면 retry 후에 실패한 종목만 다시 시도합니다. 최대 attempts번 실행합니다.
+    """
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for exchange in exchanges:
+        day = last_session(exchange, now, delay)
+        report = Checkpoint(exchange, day, root).report()
+        if report is None:
+            jobs.append((now, exchange, day))
+            continue
+        if not report["complete"] and report["attempt"] < attempts:
+            finished = datetime.fromisoformat(report["finished"])
+            jobs.append((finished + retry, exchange, day))
+            continue
+        day += timedelta(days=1)
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        jobs.append((session_close(exchange, day) + delay, exchange, day))
+    return min(jobs, key=lambda job: job[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장 마감 후 일봉 캐시 갱신 배치")
+    parser.add_argument(
+        "exchanges",
+        nargs="*",
+        default=[exchange.code for exchange in exchange_list],
+        help="갱신할 거래소코드 (default: 모든 거래소)",
+    )
+    parser.add_argument(
+        "--now", action="store_true", help="가장 최근 거래일을 한번만 갱신"
+    )
+    parser.add_argument(
+        "--delay", type=int, default=30, help="장 마감 후 대기 시간(분)"
+    )
+    parser.add_argument(
+        "--retry", type=int, default=10, help="실패한 종목 재시도 간격(분)"
+    )
+    parser.add_argument(
+        "--attempts", type=int, default=3, help="거래일별 최대 실행 횟수"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-size", type=int, default=100)
+    parser.add_argument("--root", type=Path, default=BATCH_DIR)
+    args = parser.parse_args()
+
+    exchanges = [resolve_exchange(code) for code in args.exchanges]
+    delay = timedelta(minutes=args.delay)
+    options = {"workers": args.workers, "max_size": args.max_size, "root": args.root}
+
+    if args.now:
+        now = datetime.now(timezone.utc)
+        for exchange in exchanges:
+            refresh(exchange, last_session(exchange, now, delay), **options)
+        return
+
+    while True:
+        at, exchange, day = schedule(
+            exchanges,
+            delay,
+            timedelta(minutes=args.retry),
+            args.attempts,
+            args.root,
+        )
+        if (wait := (at - datetime.now(timezone.utc)).total_seconds()) > 0:
+            log.info(
+                f"[batch] 다음 작업: {exchange.code} {day} ({at.astimezone()} 실행)"
+            )
+            time.sleep(wait)
+        try:
+            refresh(exchange, day, **options)
+        except Exception as error:  # 다음 일정에서 체크포인트부터 다시 시도합니다.
+            log.error(f"[batch] {exchange.code} {day} 갱신 중단: {error!r}")
+            time.sleep(60)
+
+
+if __name__ == "__main__":
+    main()
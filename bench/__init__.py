@@ -0,0 +1,9 @@
+"""
+벤치마크 / 네트워크 없이 로컬 스텁 서버(bench.server)로 KIS API를 대신합니다.
+- 실행: python -m bench.run [analyzer current universe bollinger orders import] [--repeat N] [--output PATH]
+- 결과는 bench/results.json에 기록됩니다. (커밋 해시, 설정, 벤치마크별 소요 시간)
+- bench/fixtures의 응답은 KIS API 문서의 응답 형식을 따르는 합성 데이터입니다.
+  서버는 fixture 행들의 날짜만 요청한 기간으로 바꿔서 돌려주므로 페이지네이션이 실제처럼 동작합니다.
+- 지표 일치 확인: python -m bench.check / 빠른 구현(bollinger, BollingerState)이 기준 구현과 같은 값을
+  내는지 합성 데이터로 확인하고, 다르면 0이 아닌 코드로 종료합니다.
+"""
@@ -0,0 +1,154 @@
+""" 빠른 지표 구현들이 기준 구현과 같은 값을 내는지 합성 데이터로 확인합니다. """
+
+import sys
+import argparse
+from typing import Dict
+
+import numpy as np
+
+from calc.rolling import BollingerState, bollinger
+
+KEYS = ("center", "upper", "lower", "perb", "bandwidth")
+
+
+def reference_bollinger(
+    price: np.ndarray, period: int = 20, multiplier: float = 2
+) -> Dict[str, np.ndarray]:
+    """
+    - 윈도우마다 평균과 표준편차를 직접 계산하는 기준 구현 (1차원 가격만)
+    - 처음 StockAnalyzer.bollinger_band와 같은 계산이며 bandwidth는 (upper - lower) / center입니다.
+    """
+    rows = {key: [] for key in KEYS}
+    for i in range(period, len(price)):
+        window = price[i - period : i]
+        center = sum(window) / period
+        std = (sum((x - center) ** 2 for x in window) / period) ** 0.5
+        upper = center + std * multiplier
+        lower = center - std * multiplier
+        rows["center"].append(center)
+        rows["upper"].append(upper)
+        rows["lower"].append(lower)
+        rows["perb"].append((price[i] - lower) / (upper - lower))
+        rows["bandwidth"].append((upper - lower) / center)
+    return {key: np.array(values) for key, values in rows.items()}
+
+
+def synthetic_price(bars: int, symbols: int = None, seed: int = 0) -> np.ndarray:
+    """큰 가격대(1e5 근처)의 랜덤 워크 / 제곱합 방식의 오차가 드러나기 쉬운 입력입니다."""
+    rng = np.random.default_rng(seed)
+    shape = (bars,) if symbols is None else (bars, symbols)
+    return 1e5 * np.exp(np.cumsum(rng.normal(0, 0.01, shape), axis=0))
+
+
+def compare(name: str, actual: dict, expected: dict, rtol: float) -> float:
+    """모든 밴드 값이 rtol 안에서 같은지 확인하고 가장 큰 상대 오차를 반환합니다."""
+    worst = 0.0
+    for key in KEYS:
+        a, e = np.asarray(actual[key]), np.asarray(expected[key])
+        np.testing.assert_allclose(a, e, rtol=rtol, err_msg=f"{name}: {key}")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            error = np.abs(a - e) / np.abs(e)
+        worst = max(worst, float(np.nanmax(error, initial=0.0)))
+    return worst
+
+
+def check_vectorized(args) -> float:
+    """bollinger()와 기준 구현"""
+    price = synthetic_price(args.bars)
+    return compare(
+        "bollinger",
+        bollinger(price, args.period),
+        reference_bollinger(price, args.period),
+        args.rtol,
+    )
+
+
+def replay(price: np.ndarray, period: int, resync: int) -> Dict[str, np.ndarray]:
+    """price를 BollingerState에 한 행씩 append한 결과를 bollinger()와 같은 형식으로 모읍니다."""
+    state = BollingerState(period, resync=resync)
+    rows = [state.append(row) for row in price]
+    assert all(row is None for row in rows[:period]), "윈도우가 차기 전에 밴드를 반환"
+    return {key: np.array([row[key] for row in rows[period:]]) for key in KEYS}
+
+
+def check_incremental(args) -> float:
+    """
+    - BollingerState.append와 bollinger()
+    - resync 주기를 짧게 설정해서 합을 다시 계산하는 경계를 여러번 지나게 합니다.
+    """
+    price = synthetic_price(args.bars)
+    assert args.bars >= args.period + 2 * args.resync, "resync 경계를 지나지 않음"
+    return compare(
+        "BollingerState",
+        replay(price, args.period, args.resync),
+        bollinger(price, args.period),
+        args.rtol,
+    )
+
+
+def check_incremental_2d(args) -> float:
+    """종목별 가격 배열을 append하는 BollingerState와 2차원 bollinger()"""
+    price = synthetic_price(args.bars, symbols=args.symbols)
+    return compare(
+        "BollingerState (2-D)",
+        replay(price, args.period, args.resync),
+        bollinger(price, args.period),
+        args.rtol,
+    )
+
+
+def check_band(args) -> float:
+    """StockAnalyzer.bollinger_state().band(다음 가격)과 다음 가격까지 포함한 bollinger()의 마지막 행"""
+    from calc.math import StockAnalyzer
+
+    price = synthetic_price(args.bars + 1)
+    date = np.datetime64("2000-01-03") + np.arange(args.bars)
+    analyzer = StockAnalyzer(
+        code="CHECK",
+        exchange="NAS",
+        date=date,
+        price=price[:-1],
+        low=price[:-1],
+        high=price[:-1],
+        tvol=np.ones(args.bars),
+        tamt=price[:-1],
+    )
+    band = analyzer.bollinger_state(args.period).band(price[-1])
+    expected = {
+        key: values[-1:] for key, values in bollinger(price, args.period).items()
+    }
+    return compare("bollinger_state().band", band, expected, args.rtol)
+
+
+checks = {
+    "vectorized": check_vectorized,
+    "incremental": check_incremental,
+    "incremental-2d": check_incremental_2d,
+    "band": check_band,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 구현 일치 여부 확인")
+    parser.add_argument("names", nargs="*", default=list(checks), help="실행할 확인")
+    parser.add_argument("--bars", type=int, default=3000)
+    parser.add_argument("--symbols", type=int, default=16)
+    parser.add_argument("--period", type=int, default=20)
+    parser.add_argument("--resync", type=int, default=256)
+    parser.add_argument("--rtol", type=float, default=1e-8)
+    args = parser.parse_args()
+
+    failed = 0
+    for name in args.names:
+        try:
+            error = checks[name](args)
+        except AssertionError as failure:
+            failed += 1
+            print(f"[check] {name}: FAILED\n{failure}")
+        else:
+            print(f"[check] {name}: ok (최대 상대 오차: {error:.2e})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
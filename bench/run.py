@@ -0,0 +1,278 @@
+""" 네트워크 없이 스텁 서버로 핫 패스들의 성능을 측정하고 결과를 JSON 파일로 기록합니다. """
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable
+
+from bench.server import StubServer
+
+root = Path(__file__).resolve().parent.parent
+
+
+def measure(func: Callable, repeat: int) -> dict:
+    """func를 repeat번 실행한 소요 시간(초) 통계"""
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(elapsed),
+        "median": statistics.median(elapsed),
+        "mean": statistics.fmean(elapsed),
+        "max": max(elapsed),
+    }
+
+
+def http_requests() -> int:
+    """지금까지 kis.client가 보낸 요청 수 (system.metrics 기준)"""
+    from system.metrics import metrics
+
+    return sum(
+        metric["count"]
+        for name, metric in metrics.snapshot().items()
+        if name.startswith("http:")
+    )
+
+
+def bench_analyzer(args) -> dict:
+    """Stock.analyzer 페이지네이션 / 캐시 없이 매번 모든 페이지를 받습니다."""
+    from kis.get import KRX, NAS, Stock
+
+    results = {}
+    for exchange, code in ((NAS, "AAPL"), (KRX, "005930")):
+        stock = Stock(code=code, exchange=exchange)
+        for max_size in args.sizes:
+            before = http_requests()
+            stats = measure(
+                lambda: stock.analyzer(max_size=max_size, cache=None), args.repeat
+            )
+            stats["requests"] = (http_requests() - before) / args.repeat
+            stats["bars"] = stock.analyzer(max_size=max_size, cache=None).length
+            results[f"{exchange.code}/{code}/{max_size}"] = stats
+    return results
+
+
+def bench_current(args) -> dict:
+    """Stock.current, AsyncStock.current 지연 시간 / 국내(KRX)와 해외(NAS) 현재가 API"""
+    import asyncio
+
+    from kis.aio import AsyncClient, AsyncStock
+    from kis.get import KRX, NAS, Stock
+
+    async def current_async(exchange, code: str) -> dict:
+        async with AsyncClient() as client:
+            stock = AsyncStock(code=code, exchange=exchange, client=client)
+            await stock.current()  # 토큰, 주야간 여부를 미리 받습니다.
+            elapsed = []
+            for _ in range(args.repeat * 10):
+                start = time.perf_counter()
+                await stock.current()
+                elapsed.append(time.perf_counter() - start)
+            return {"median": statistics.median(elapsed), "max": max(elapsed)}
+
+    results = {}
+    for exchange, code in ((KRX, "005930"), (NAS, "AAPL")):
+        stock = Stock(code=code, exchange=exchange)
+        results[f"{exchange.code}/{code}"] = {"price": stock.current()} | measure(
+            stock.current, args.repeat * 10
+        )
+        results[f"{exchange.code}/{code}/async"] = asyncio.run(
+            current_async(exchange, code)
+        )
+    return results
+
+
+def bench_universe(args) -> dict:
+    """
+    - kis.get.all 처리량 / NAS 종목 중 args.symbols개를 불러옵니다.
+    - 매 반복마다 다른 종목들을 사용하므로 항상 캐시가 비어있는 상태로 측정됩니다.
+    """
+    from kis import get
+    from kis.get import NAS, StockExchange
+
+    runs = []
+    for i in range(args.repeat):
+        codes = NAS.stocks[i * args.symbols : (i + 1) * args.symbols]
+        subset = StockExchange(
+            code=NAS.code, name=NAS.name, currency=NAS.currency, stocks=codes
+        )
+        before = http_requests()
+        start = time.perf_counter()
+        analyzers = get.all(
+            [subset],
+            max_size=args.universe_size,
+            workers=args.workers,
+            on_progress=lambda *_: None,
+        )
+        elapsed = time.perf_counter() - start
+        runs.append(
+            {
+                "elapsed": elapsed,
+                "symbols": len(analyzers),
+                "requests": http_requests() - before,
+                "throughput": len(analyzers) / elapsed,
+            }
+        )
+    return {
+        "symbols": args.symbols,
+        "max_size": args.universe_size,
+        "workers": args.workers,
+        "throughput": statistics.median(run["throughput"] for run in runs),
+        "runs": runs,
+    }
+
+
+def bench_bollinger(args) -> dict:
+    """합성 일봉 데이터(args.bars개)로 bollinger_band 계산"""
+    import numpy as np
+
+    from calc.math import StockAnalyzer
+
+    rng = np.random.default_rng(0)
+    price = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, args.bars)))
+    start = datetime(2000, 1, 3)
+    analyzer = StockAnalyzer(
+        code="BENCH",
+        exchange="NAS",
+        date=[start + timedelta(days=i) for i in range(args.bars)],
+        price=price,
+        low=price * 0.99,
+        high=price * 1.01,
+        tvol=rng.integers(10**5, 10**7, args.bars).astype(float),
+        tamt=price * 10**6,
+    )
+    return {"bars": args.bars} | measure(analyzer.bollinger_band, args.repeat * 10)
+
+
+def bench_orders(args) -> dict:
+    """kis.post.OrderQueue로 args.orders개의 주문을 한번에 전송합니다."""
+    from kis.get import KRX, NAS
+    from kis.post import Order, OrderQueue
+
+    orders = [
+        Order(NAS, code, "buy", 1, 100.0) if i % 2 else Order(KRX, "005930", "sell", 1)
+        for i, code in enumerate(NAS.stocks[: args.orders])
+    ]
+    start = time.perf_counter()
+    with OrderQueue() as queue:
+        queue.submit_all(orders)
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "throughput": len(orders) / elapsed} | queue.report()
+
+
+def bench_import(args) -> dict:
+    """새 인터프리터에서 import kis에 걸리는 시간"""
+    code = "import time; s = time.perf_counter(); import kis; print(time.perf_counter() - s)"
+    elapsed = []
+    for _ in range(args.repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            env=os.environ,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed.append(float(out.stdout.split()[-1]))
+    return {
+        "repeat": args.repeat,
+        "min": min(elapsed),
+        "median": statistics.median(elapsed),
+        "max": max(elapsed),
+    }
+
+
+benchmarks = {
+    "analyzer": bench_analyzer,
+    "current": bench_current,
+    "universe": bench_universe,
+    "bollinger": bench_bollinger,
+    "orders": bench_orders,
+    "import": bench_import,
+}
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        )
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ivot 벤치마크")
+    parser.add_argument(
+        "names", nargs="*", default=list(benchmarks), help="실행할 벤치마크"
+    )
+    parser.add_argument("--output", type=Path, default=root / "bench" / "results.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="스텁 서버 응답 지연(초)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=1e6,
+        help="초당 요청 수 제한 (KIS 실제 제한: 18)",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--universe-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--bars", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=200)
+    args = parser.parse_args()
+
+    server = StubServer(latency=args.latency)
+    with server, tempfile.TemporaryDirectory() as tmp:
+        # kis 모듈들은 import 시점에 환경변수를 읽으므로 import 전에 설정합니다.
+        os.environ |= {
+            "KIS_URL": server.url,
+            "KIS_APP_KEY": "bench",
+            "KIS_APP_SECRET": "bench",
+            "KIS_RATE_LIMIT": str(args.rate_limit),
+            "KIS_CACHE_DIR": str(Path(tmp) / "history"),
+            "KIS_TOKEN_FILE": str(Path(tmp) / "token.json"),
+            "KIS_CANO": "00000000",
+            "KIS_ACNT_PRDT_CD": "01",
+        }
+        results = {}
+        for name in args.names:
+            print(f"[bench] {name} ...", flush=True)
+            results[name] = benchmarks[name](args)
+
+    report = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(results, indent=2))
+    print(f"[bench] results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+""" KIS API 응답 fixture를 재생하는 로컬 스텁 서버입니다. """
+
+import json
+import time
+import zlib
+import threading
+from pathlib import Path
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from typing import List, Optional
+
+fixtures_dir = Path(__file__).resolve().parent / "fixtures"
+
+# 요청 경로 끝부분 -> fixture 파일 이름
+FIXTURES = {
+    "inquire-daily-itemchartprice": "inquire-daily-itemchartprice",
+    "dailyprice": "dailyprice",
+    "price": "price",  # 해외주식 현재체결가
+    "inquire-price": "inquire-price",  # 국내주식 현재가
+    "inquire-search": "inquire-search",
+}
+
+
+def load_fixture(name: str) -> dict:
+    return json.loads((fixtures_dir / f"{name}.json").read_text(encoding="utf-8"))
+
+
+class Market:
+    """
+    - 종목마다 상장일이 다른 가상의 일봉 데이터를 만듭니다.
+    - 가격 등의 값은 fixture의 output2 행들을 반복해서 사용하고 날짜만 바꿉니다.
+    - 상장일은 종목코드 해시로 정해지며 오늘로부터 listed ~ listed * 2 일 전입니다.
+    """
+
+    def __init__(self, listed: int = 1500):
+        self.listed = listed
+        self.today = date.today()
+
+    def listing_day(self, code: str) -> date:
+        return self.today - timedelta(
+            days=self.listed + zlib.crc32(code.encode()) % self.listed
+        )
+
+    def days(
+        self, code: str, end: str, start: str = None, size: int = 100
+    ) -> List[str]:
+        """end(yyyymmdd)부터 과거 방향으로 최대 size개의 평일 (최신 -> 과거 순서)"""
+        day = min(date(int(end[:4]), int(end[4:6]), int(end[6:])), self.today)
+        first = self.listing_day(code)
+        if start:
+            first = max(first, date(int(start[:4]), int(start[4:6]), int(start[6:])))
+        days = []
+        while len(days) < size and day >= first:
+            if day.weekday() < 5:
+                days.append(day.strftime("%Y%m%d"))
+            day -= timedelta(days=1)
+        return days
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용
+    # 헤더와 본문이 따로 전송되므로 Nagle 알고리즘을 끄지 않으면 응답마다 delayed ACK(~40ms)만큼 지연됩니다.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: dict):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = urlparse(self.path).path
+        if path.endswith("tokenP"):
+            expired = date.today() + timedelta(days=1)
+            self._send(
+                {
+                    "access_token": "bench-token",
+                    "access_token_token_expired": f"{expired} 00:00:00",
+                    "token_type": "Bearer",
+                    "expires_in": 86400,
+                }
+            )
+        elif path.endswith(("/order", "/order-cash")):  # 주문
+            self.server.orders += 1
+            self._send(
+                {
+                    "rt_cd": "0",
+                    "msg_cd": "APBK0013",
+                    "msg1": "주문 전송 완료 되었습니다.",
+                    "output": {
+                        "KRX_FWDG_ORD_ORGNO": "91252",
+                        "ODNO": f"{self.server.orders:010d}",
+                        "ORD_TMD": time.strftime("%H%M%S"),
+                    },
+                }
+            )
+        elif path.endswith("Approval"):
+            self._send({"approval_key": "bench-approval-key"})
+        else:  # /uapi/hashkey
+            self._send({"HASH": "bench-hash"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: value[0] for key, value in parse_qs(url.query).items()}
+        name = url.path.rsplit("/", 1)[-1]
+        if name == "dayornight":
+            return self._send({"output": {"PSBL_YN": "Y"}, "rt_cd": "0"})
+        if name not in FIXTURES:
+            self.send_error(404)
+            return
+        body = self.server.fixtures[FIXTURES[name]]
+        if name == "dailyprice":
+            body = self._history(body, "xymd", params["SYMB"], params["BYMD"])
+        elif name == "inquire-daily-itemchartprice":
+            body = self._history(
+                body,
+                "stck_bsop_date",
+                params["FID_INPUT_ISCD"],
+                params["FID_INPUT_DATE_2"],
+                params["FID_INPUT_DATE_1"],
+            )
+        elif name == "inquire-search":
+            body = body | {
+                "output2": [
+                    row
+                    | {
+                        "excd": params["EXCD"],
+                        "rsym": f"D{params['EXCD']}{row['symb']}",
+                    }
+                    for row in body["output2"]
+                ]
+            }
+        self._send(body)
+
+    def _history(
+        self, body: dict, date_key: str, code: str, end: str, start: str = None
+    ) -> dict:
+        """
+        - fixture 행들의 날짜를 요청한 기간으로 바꿔서 반환합니다.
+        - 해외 일봉(start 없음)은 실제 API처럼 상장일 이전 행을 빈 문자열로 채웁니다.
+        """
+        rows = body["output2"]
+        days = self.server.market.days(code, end, start, size=len(rows))
+        output = [row | {date_key: day} for row, day in zip(rows, days)]
+        if start is None:
+            empty = dict.fromkeys(rows[0], "")
+            output += [empty] * (len(rows) - len(output))
+        return body | {"output2": output}
+
+
+class StubServer:
+    """
+    - 백그라운드 스레드에서 실행되는 스텁 서버 / with StubServer() as server: 로 사용합니다.
+    - latency: 응답마다 추가할 지연 시간(초) / 네트워크 왕복 시간을 흉내냅니다.
+    - url: kis.client.KIS_URL(환경변수 KIS_URL)로 사용할 주소
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, listed: int = 1500):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.orders = 0  # 접수한 주문 수 / 주문번호로 사용합니다.
+        self.httpd.market = Market(listed)
+        self.httpd.fixtures = {
+            name: load_fixture(name) for name in set(FIXTURES.values())
+        }
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KIS API 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.latency)
+    print(f"serving on {server.url}")
+    server.httpd.serve_forever()
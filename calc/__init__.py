@@ -1 +1,4 @@
 from calc.math import *
+from calc.rolling import *
+from calc.panel import *
+from calc.engine import *
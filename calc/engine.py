@@ -0,0 +1,186 @@
+""" 여러 종목의 지표를 여러 프로세스로 나눠서 계산합니다. """
+
+import os
+import zlib
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from calc.math import StockAnalyzer
+from calc.rolling import bollinger
+from system.metrics import metrics
+
+BANDS = ("center", "upper", "lower", "perb", "bandwidth")
+
+
+def _bollinger_shard(
+    name: str, total: int, bounds: List[Tuple[int, int]], period: int, multiplier: float
+) -> int:
+    """
+    - 워커 프로세스에서 실행됩니다. 공유 메모리에 붙어서 bounds 구간의 종목들을 계산합니다.
+    - 공유 메모리 레이아웃: (1 + len(BANDS), total) float64 행렬 / 0행: 가격, 나머지: BANDS 순서의 결과
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        table = np.ndarray((1 + len(BANDS), total), dtype=np.float64, buffer=shm.buf)
+        price, outputs = table[0], table[1:]
+        for start, end in bounds:
+            if end - start <= period:
+                continue
+            bands = bollinger(price[start:end], period, multiplier)
+            for row, key in zip(outputs, BANDS):
+                row[start + period : end] = bands[key]
+        del table, price, outputs  # 공유 메모리를 닫기 전에 뷰를 해제합니다.
+    finally:
+        shm.close()
+    return len(bounds)
+
+
+class ResultTable:
+    """
+    - IndicatorEngine의 계산 결과 / 모든 종목의 결과가 하나의 평평한 배열에 이어져 있습니다.
+    - i번째 종목의 데이터는 offsets[i]:offsets[i + 1] 구간이며 각 종목의 처음 period개 값은 nan입니다.
+    - codes, exchanges: 입력한 StockAnalyzer 순서의 종목코드와 거래소
+    """
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        exchanges: list,
+        offsets: np.ndarray,
+        date: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        period: int,
+    ):
+        self.codes = codes
+        self.exchanges = exchanges
+        self.offsets = offsets
+        self.date = date
+        self.columns = columns
+        self.period = period
+
+    def series(self, i: int) -> Dict[str, np.ndarray]:
+        """i번째 종목의 결과 / StockAnalyzer.bollinger_band와 같은 형식"""
+        start, end = self.offsets[i] + self.period, self.offsets[i + 1]
+        start = min(start, end)
+        return {"date": self.date[start:end]} | {
+            key: values[start:end] for key, values in self.columns.items()
+        }
+
+    def latest(self, key: str) -> np.ndarray:
+        """각 종목의 가장 최근 값 / 데이터가 period개 이하인 종목은 nan"""
+        ends = self.offsets[1:]
+        valid = ends - self.offsets[:-1] > self.period
+        values = np.full(len(self), np.nan)
+        values[valid] = self.columns[key][ends[valid] - 1]
+        return values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return f"<calc.engine.ResultTable (symbols: {len(self)}, rows: {self.offsets[-1]})>"
+
+
+class IndicatorEngine:
+    """
+    - 여러 StockAnalyzer의 지표를 프로세스 풀로 나눠서 계산합니다.
+    - 모든 종목의 가격을 하나의 공유 메모리(multiprocessing.shared_memory) 버퍼에 이어붙여서 전달하므로
+      StockAnalyzer를 pickle하지 않습니다. 워커는 결과도 같은 공유 메모리에 기록합니다.
+    - shard: 종목을 워커에 나누는 기준
+        - "hash": 종목코드 해시 / 종목 수가 고르게 나뉩니다.
+        - "exchange": 거래소 / 같은 거래소의 종목들을 한 워커가 계산합니다.
+    - with IndicatorEngine() as engine: 로 사용하면 여러 번 계산해도 프로세스 풀을 재사용합니다.
+    """
+
+    def __init__(self, workers: int = None, shard: str = "hash"):
+        if shard not in ("hash", "exchange"):
+            raise ValueError(f"지원하지 않는 shard 기준입니다: {shard}")
+        self.workers = workers or os.cpu_count()
+        self.shard = shard
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _shards(self, analyzers: List[StockAnalyzer]) -> List[List[int]]:
+        """종목 인덱스들을 샤드로 나눕니다."""
+        if self.shard == "exchange":
+            keys = [str(getattr(a.exchange, "code", a.exchange)) for a in analyzers]
+            groups = {key: [] for key in keys}
+        else:  # 워커보다 샤드를 많이 만들어서 샤드별 작업량 차이를 줄입니다.
+            keys = [zlib.crc32(a.code.encode()) % (self.workers * 4) for a in analyzers]
+            groups = {key: [] for key in sorted(set(keys))}
+        for i, key in enumerate(keys):
+            groups[key].append(i)
+        return list(groups.values())
+
+    @metrics.timed("calc.IndicatorEngine.bollinger_band")
+    def bollinger_band(
+        self, analyzers: List[StockAnalyzer], period: int = 20, multiplier: float = 2
+    ) -> ResultTable:
+        """모든 종목의 볼린저 밴드를 계산합니다. (StockAnalyzer.bollinger_band 참고)"""
+        lengths = np.array([analyzer.length for analyzer in analyzers], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        total = int(offsets[-1])
+
+        shm = shared_memory.SharedMemory(
+            create=True, size=max(8 * (1 + len(BANDS)) * total, 1)
+        )
+        try:
+            table = np.ndarray(
+                (1 + len(BANDS), total), dtype=np.float64, buffer=shm.buf
+            )
+            table[1:] = np.nan
+            for analyzer, start, end in zip(analyzers, offsets[:-1], offsets[1:]):
+                table[0, start:end] = analyzer.price
+
+            tasks = [
+                (
+                    shm.name,
+                    total,
+                    [(int(offsets[i]), int(offsets[i + 1])) for i in shard],
+                    period,
+                    multiplier,
+                )
+                for shard in self._shards(analyzers)
+            ]
+            if self.workers > 1 and len(tasks) > 1:
+                executor = self._executor or ProcessPoolExecutor(self.workers)
+                try:
+                    list(executor.map(_bollinger_shard, *zip(*tasks)))
+                finally:
+                    if executor is not self._executor:
+                        executor.shutdown()
+            else:  # 나눌 필요가 없으면 현재 프로세스에서 계산합니다.
+                for task in tasks:
+                    _bollinger_shard(*task)
+
+            columns = {key: table[1 + i].copy() for i, key in enumerate(BANDS)}
+            del table
+        finally:
+            shm.close()
+            shm.unlink()
+
+        date = (
+            np.concatenate([analyzer.date for analyzer in analyzers])
+            if analyzers
+            else np.array([], "datetime64[D]")
+        )
+        return ResultTable(
+            codes=np.array([analyzer.code for analyzer in analyzers]),
+            exchanges=[analyzer.exchange for analyzer in analyzers],
+            offsets=offsets,
+            date=date,
+            columns=columns,
+            period=period,
+        )
@@ -1,12 +1,35 @@
-from math import sqrt
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from collections import defaultdict
 
 import numpy as np
 
+from calc.rolling import BollingerState, bollinger
+from system.metrics import metrics
+
 
 class StockAnalyzer:
+    """
+    - 한 종목의 일봉 데이터 / 과거 -> 현재 순서의 컬럼 배열들을 가집니다.
+        - date: datetime64[D], 나머지: float64
+        - open, close는 입력한 경우에만 배열이고 아니면 None입니다.
+    - analyzer[start:end]: 일부 기간의 StockAnalyzer / 배열을 복사하지 않는 뷰입니다.
+        - start, end는 인덱스 또는 날짜(datetime, date, "YYYY-MM-DD")이며 end는 포함하지 않습니다.
+    """
+
+    __slots__ = (
+        "code",
+        "exchange",
+        "date",
+        "price",
+        "low",
+        "high",
+        "open",
+        "close",
+        "tvol",
+        "tamt",
+    )
+    columns = ("date", "price", "low", "high", "open", "close", "tvol", "tamt")
+
     class InvalidParameter(Exception):
         """가진 데이터 크기보다 큰 파라미터가 입력된 경우 발생하는 예외 클래스"""
 
@@ -15,55 +38,84 @@ class StockAnalyzer:
         *,
         code: str,  # 종목코드
         exchange: str,  # 거래소코드
-        date: List[datetime],  # 날짜 리스트
-        price: List[float],  # 가격(종가) 리스트
+        date: List[datetime],  # 날짜 리스트 (datetime64[D] 배열로 저장됩니다.)
+        price: List[float],  # 가격(typical price) 리스트
         low: List[float],  # 최저가 리스트
         high: List[float],  # 최고가 리스트
         tvol: List[float],  # 거래량 리스트
         tamt: List[float],  # 거래대금 리스트
+        open: Optional[List[float]] = None,  # 시가 리스트
+        close: Optional[List[float]] = None,  # 종가 리스트
     ):
         self.code = code
         self.exchange = exchange
-        if not (
-            len(date) == len(price) == len(low) == len(high) == len(tvol) == len(tamt)
+        # 이미 알맞은 타입의 배열이면 복사하지 않습니다.
+        self.date = np.asarray(date, dtype="datetime64[D]")
+        for key, values in zip(
+            ("price", "low", "high", "open", "close", "tvol", "tamt"),
+            (price, low, high, open, close, tvol, tamt),
         ):
-            raise ValueError(
-                "데이터의 길이가 일정하지 않습니다."
-                f"date: {len(date)}, price: {len(price)}, low: {len(low)}, high: {len(high)}, tvol: {len(tvol)}, tamt: {len(tamt)}"
-            )
-        self.date = np.array(date)
-        self.price = np.array(price)
-        self.tvol = np.array(tvol)
-        self.tamt = np.array(tamt)
-        self.length = len(date)  # 0일 수 있음
+            if values is not None:
+                values = np.asarray(values, dtype=np.float64)
+                if len(values) != len(self.date):
+                    raise ValueError(
+                        "데이터의 길이가 일정하지 않습니다."
+                        f"date: {len(self.date)}, {key}: {len(values)}"
+                    )
+            setattr(self, key, values)
+
+    @property
+    def length(self) -> int:
+        return len(self.date)  # 0일 수 있음
+
+    def _index(self, key) -> Optional[int]:
+        """슬라이스의 start/end를 인덱스로 변환합니다. 날짜는 이진 탐색합니다."""
+        if key is None or isinstance(key, (int, np.integer)):
+            return key
+        return int(np.searchsorted(self.date, np.datetime64(key, "D")))
 
+    def __getitem__(self, key: slice) -> "StockAnalyzer":
+        if not isinstance(key, slice):
+            raise TypeError("StockAnalyzer는 슬라이스로만 인덱싱할 수 있습니다.")
+        key = slice(self._index(key.start), self._index(key.stop), key.step)
+        view = object.__new__(StockAnalyzer)
+        view.code = self.code
+        view.exchange = self.exchange
+        for name in self.columns:
+            values = getattr(self, name)
+            setattr(view, name, None if values is None else values[key])
+        return view
+
+    def __len__(self) -> int:
+        return self.length
+
+    @metrics.timed("calc.StockAnalyzer.bollinger_band")
     def bollinger_band(self, period=20, multiplier=2):
-        """date, centor, upper, lower, perb, bandwidth"""
+        """
+        - date, center, upper, lower, perb, bandwidth
+        - 각 값은 i번째 날짜(i >= period)와 직전 period일 가격으로 계산한 NumPy 배열입니다.
+        """
         if period > self.length:
             raise self.InvalidParameter
 
-        data = defaultdict(list)
-
-        for i, price in enumerate(self.price[period:], start=period):
-            window = self.price[i - period : i]
-            average = sum(window) / period
-            std = sqrt(sum([(x - average) ** 2 for x in window]) / period)  # 표준편차
-            upper = average + (std * multiplier)
-            lower = average - (std * multiplier)
-            perb = (price - lower) / (upper - lower)
-            bandwidth = upper - lower / average
+        return {"date": self.date[period:]} | bollinger(self.price, period, multiplier)
 
-            data["date"].append(self.date[i])
-            data["center"].append(average)
-            data["upper"].append(upper)
-            data["lower"].append(lower)
-            data["perb"].append(perb)
-            data["bandwidth"].append(bandwidth)
+    def bollinger_state(self, period=20, multiplier=2) -> BollingerState:
+        """
+        - 마지막 period일 가격으로 채운 BollingerState를 반환합니다.
+        - 새 일봉은 state.append(price, date), 장중 현재가는 state.band(price)로
+          전체 데이터를 다시 계산하지 않고 bollinger_band의 다음 행을 얻을 수 있습니다.
+        """
+        if period > self.length:
+            raise self.InvalidParameter
 
-        return dict(data)
+        state = BollingerState(period, multiplier)
+        for price, date in zip(self.price[-period:], self.date[-period:]):
+            state.append(price, date)
+        return state
 
     def __repr__(self) -> str:
-        return f"<calc.math.StockAnalyzer {self.code}/{self.exchange} (length: {self.length}, ref_date: {self.date[0]})>"
+        return f"<calc.math.StockAnalyzer {self.code}/{self.exchange} (length: {self.length}, ref_date: {self.date[0] if self.length else None})>"
 
     def __bool__(self) -> bool:  # 가진 데이터가 없으면 이 객체는 False이다.
         return True if self.length else False
@@ -0,0 +1,96 @@
+from typing import Dict, List
+
+import numpy as np
+
+from calc.math import StockAnalyzer
+from calc.rolling import bollinger
+from system.metrics import metrics
+
+
+class StockPanel:
+    """
+    - 여러 StockAnalyzer를 (날짜 x 종목) 행렬로 묶어서 종목 전체를 한번에 계산합니다.
+    - date: 모든 종목의 날짜를 합친 달력(datetime64[D])
+    - price, tvol, tamt: (len(date), len(codes)) 크기의 행렬 / 종목에 없는 날짜는 nan
+    """
+
+    def __init__(self, analyzers: List[StockAnalyzer]):
+        self.codes = np.array([analyzer.code for analyzer in analyzers])
+        self.exchanges = [analyzer.exchange for analyzer in analyzers]
+        dates = [
+            np.asarray(analyzer.date, dtype="datetime64[D]") for analyzer in analyzers
+        ]
+        self.date = (
+            np.unique(np.concatenate(dates)) if dates else np.array([], "datetime64[D]")
+        )
+
+        shape = (len(self.date), len(analyzers))
+        self.price = np.full(shape, np.nan)
+        self.tvol = np.full(shape, np.nan)
+        self.tamt = np.full(shape, np.nan)
+        for column, (analyzer, date) in enumerate(zip(analyzers, dates)):
+            rows = np.searchsorted(self.date, date)
+            self.price[rows, column] = analyzer.price
+            self.tvol[rows, column] = analyzer.tvol
+            self.tamt[rows, column] = analyzer.tamt
+
+    def _per_symbol(self, matrix: np.ndarray, func) -> Dict[str, np.ndarray]:
+        """
+        - 각 종목의 nan이 아닌 값들만 위로 모아서 func를 한번에 적용한 뒤 원래 날짜 위치로 되돌립니다.
+        - 종목마다 거래일이 달라도 종목별로 계산한 결과와 같습니다.
+        - func는 길이 n의 행렬을 받아 길이 n - k의 행렬들을 반환해야 하며, 앞쪽 k행은 nan으로 채워집니다.
+        """
+        order = np.argsort(np.isnan(matrix), axis=0, kind="stable")
+        result = {}
+        for key, values in func(np.take_along_axis(matrix, order, axis=0)).items():
+            padded = np.full(matrix.shape, np.nan)
+            padded[len(matrix) - len(values) :] = values
+            restored = np.full(matrix.shape, np.nan)
+            np.put_along_axis(restored, order, padded, axis=0)
+            result[key] = np.where(np.isnan(matrix), np.nan, restored)
+        return result
+
+    @metrics.timed("calc.StockPanel.bollinger_band")
+    def bollinger_band(self, period=20, multiplier=2) -> Dict[str, np.ndarray]:
+        """
+        - date, center, upper, lower, perb, bandwidth
+        - 모든 종목의 볼린저 밴드를 (날짜 x 종목) 행렬로 한번에 계산합니다.
+        - 값이 정의되지 않는 위치(각 종목의 처음 period일, 거래가 없는 날짜)는 nan입니다.
+        """
+        if period > len(self.date):
+            raise StockAnalyzer.InvalidParameter
+
+        bands = self._per_symbol(
+            self.price, lambda price: bollinger(price, period, multiplier)
+        )
+        return {"date": self.date} | bands
+
+    def latest(self, matrix: np.ndarray) -> np.ndarray:
+        """각 종목(열)의 가장 최근 nan이 아닌 값 / 값이 없으면 nan"""
+        if not len(matrix):
+            return np.full(matrix.shape[1], np.nan)
+        valid = ~np.isnan(matrix)
+        rows = len(matrix) - 1 - np.argmax(valid[::-1], axis=0)
+        values = matrix[rows, np.arange(matrix.shape[1])]
+        return np.where(valid.any(axis=0), values, np.nan)
+
+    def select(self, mask: np.ndarray) -> np.ndarray:
+        """종목별 boolean mask로 필터링한 종목코드 배열을 반환합니다."""
+        return self.codes[mask]
+
+    def __getitem__(self, mask) -> "StockPanel":
+        """종목(열)을 선택한 새로운 StockPanel을 반환합니다. 행렬은 복사됩니다."""
+        panel = object.__new__(StockPanel)
+        panel.codes = self.codes[mask]
+        panel.exchanges = list(np.array(self.exchanges, dtype=object)[mask])
+        panel.date = self.date
+        panel.price = self.price[:, mask]
+        panel.tvol = self.tvol[:, mask]
+        panel.tamt = self.tamt[:, mask]
+        return panel
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return f"<calc.panel.StockPanel (symbols: {len(self.codes)}, dates: {len(self.date)})>"
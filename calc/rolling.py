@@ -0,0 +1,171 @@
+""" NumPy 기반 이동 윈도우 연산 """
+
+from typing import Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def rolling_mean_std(
+    values: np.ndarray, period: int, block: int = 256
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    - values[i - period + 1 : i + 1] 윈도우들의 평균과 (모)표준편차를 한번에 계산합니다.
+    - 첫번째 축(시간축)을 따라 계산하므로 2차원 배열(날짜 x 종목)도 입력할 수 있습니다.
+    - 반환되는 배열의 길이는 len(values) - period + 1 입니다. nan이 포함된 윈도우의 결과는 nan입니다.
+    - 윈도우 크기의 임시 배열 없이 누적합으로 계산합니다. (BollingerState와 같은 방식)
+        - block개 윈도우마다 첫 윈도우의 평균을 기준(shift)으로 잡고 그 윈도우의 합은 직접 계산합니다.
+        - 나머지 윈도우는 들어오는 값과 나가는 값의 차이를 누적하므로 오차가 block개 이상 쌓이지 않습니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < period:
+        empty = np.empty((0,) + values.shape[1:])
+        return empty, empty.copy()
+    count, rest = len(values) - period + 1, values.shape[1:]
+    missing = np.isnan(values)
+    if has_missing := missing.any():
+        values = np.where(missing, 0.0, values)
+
+    starts = np.arange(0, count, block)
+    first = sliding_window_view(values, period, axis=0)[starts]  # 블록의 첫 윈도우들
+    shift = first.mean(axis=-1)
+    first = first - shift[..., np.newaxis]
+    shifts = np.repeat(shift, block, axis=0)[:count]
+
+    # sums[:, k]: k번째 윈도우의 합 - (k - 1)번째 윈도우의 합 / 블록의 첫 윈도우는 합 자체
+    # - 블록 단위로 누적합을 계산하면 윈도우의 합(sums[0])과 제곱합(sums[1])이 됩니다.
+    blocks = -(-count // block)
+    sums = np.zeros((2, blocks * block) + rest)
+    incoming = values[period:] - shifts[1:]
+    outgoing = values[: count - 1] - shifts[1:]
+    np.subtract(incoming, outgoing, out=sums[0, 1:count])
+    incoming *= incoming
+    outgoing *= outgoing
+    np.subtract(incoming, outgoing, out=sums[1, 1:count])
+    del incoming, outgoing
+    sums[0, starts] = first.sum(axis=-1)
+    sums[1, starts] = (first * first).sum(axis=-1)
+    blocked = sums.reshape((2, blocks, block) + rest)
+    np.cumsum(blocked, axis=2, out=blocked)
+
+    deviation = sums[0, :count] / period
+    std = sums[1, :count] / period
+    std -= deviation * deviation
+    np.sqrt(np.maximum(std, 0.0, out=std), out=std)
+    mean = np.add(shifts, deviation, out=deviation)
+
+    if has_missing:
+        counts = np.concatenate([np.zeros((1,) + rest, int), missing.cumsum(axis=0)])
+        invalid = counts[period:] - counts[:count] > 0
+        mean[invalid] = np.nan
+        std[invalid] = np.nan
+    return mean, std
+
+
+def bollinger(
+    price: np.ndarray, period: int = 20, multiplier: float = 2
+) -> Dict[str, np.ndarray]:
+    """
+    - i번째 가격을 직전 period개 가격의 볼린저 밴드와 비교합니다. (i >= period)
+    - center, upper, lower, perb, bandwidth 배열을 담은 dict를 반환합니다.
+    - 윈도우의 표준편차가 0이면 perb는 nan입니다.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    center, std = rolling_mean_std(price[:-1], period)
+    upper = center + std * multiplier
+    lower = center - std * multiplier
+    with np.errstate(divide="ignore", invalid="ignore"):
+        perb = (price[period:] - lower) / (upper - lower)
+        bandwidth = (upper - lower) / center
+    return {
+        "center": center,
+        "upper": upper,
+        "lower": lower,
+        "perb": perb,
+        "bandwidth": bandwidth,
+    }
+
+
+class BollingerState:
+    """
+    - bollinger()를 새 가격이 들어올 때마다 갱신하는 버전입니다. append는 period와 무관하게 O(1)입니다.
+    - 직전 period개 가격의 합과 제곱합을 유지합니다.
+        - 큰 가격에서 오차가 커지지 않도록 shift(기준 가격)와의 차이로 합을 계산하고,
+          resync번 append할 때마다 윈도우로부터 합을 다시 계산해서 오차가 쌓이지 않게 합니다.
+    - price는 스칼라 또는 종목별 가격 배열(매번 같은 shape)일 수 있습니다.
+    """
+
+    def __init__(self, period: int = 20, multiplier: float = 2, resync: int = 1024):
+        self.period = period
+        self.multiplier = multiplier
+        self.resync = resync
+        self.count = 0  # 지금까지 append된 가격 수
+        self.date = None  # 마지막으로 append된 가격의 날짜
+        self.window = None  # 직전 period개 가격의 순환 버퍼
+        self.shift = self.sum = self.sumsq = None
+
+    @property
+    def ready(self) -> bool:
+        """윈도우가 가득 차서 밴드를 계산할 수 있는지 여부"""
+        return self.count >= self.period
+
+    def _resync(self):
+        self.shift = self.window.mean(axis=0)
+        deviation = self.window - self.shift
+        self.sum = deviation.sum(axis=0)
+        self.sumsq = (deviation * deviation).sum(axis=0)
+
+    def band(self, price) -> Dict[str, np.ndarray]:
+        """
+        - price를 현재 윈도우(직전 period개 가격)의 볼린저 밴드와 비교합니다. 상태는 바뀌지 않습니다.
+        - 장중 현재가처럼 아직 확정되지 않은 가격에 사용합니다.
+        - center, upper, lower, perb, bandwidth / 윈도우가 가득 차지 않았으면 None
+        """
+        if not self.ready:
+            return None
+        price = np.asarray(price, dtype=np.float64)
+        mean = self.sum / self.period
+        std = np.sqrt(np.maximum(self.sumsq / self.period - mean * mean, 0))
+        center = self.shift + mean
+        upper = center + std * self.multiplier
+        lower = center - std * self.multiplier
+        with np.errstate(divide="ignore", invalid="ignore"):
+            perb = (price - lower) / (upper - lower)
+            bandwidth = (upper - lower) / center
+        return {
+            "center": center[()],
+            "upper": upper[()],
+            "lower": lower[()],
+            "perb": perb[()],
+            "bandwidth": bandwidth[()],
+        }
+
+    def append(self, price, date=None) -> Dict[str, np.ndarray]:
+        """
+        - 확정된 가격(일봉 등)을 추가합니다.
+        - 추가하기 전의 윈도우로 계산한 price의 밴드(band 참고)를 date와 함께 반환합니다.
+          bollinger()의 마지막 행과 같은 값입니다.
+        """
+        price = np.array(price, dtype=np.float64)
+        if self.window is None:
+            self.window = np.empty((self.period,) + price.shape)
+            self.shift = price.copy()
+            self.sum = np.zeros(price.shape)
+            self.sumsq = np.zeros(price.shape)
+
+        result = self.band(price)
+        i = self.count % self.period
+        deviation = price - self.shift
+        if self.ready:  # 가장 오래된 가격을 윈도우에서 뺍니다.
+            old = self.window[i] - self.shift
+            self.sum += deviation - old
+            self.sumsq += deviation * deviation - old * old
+        else:
+            self.sum += deviation
+            self.sumsq += deviation * deviation
+        self.window[i] = price
+        self.count += 1
+        self.date = date
+        if self.ready and self.count % self.resync == 0:
+            self._resync()
+        return None if result is None else {"date": date} | result
@@ -0,0 +1,243 @@
+""" asyncio 이벤트 루프에서 사용하는 kis.get.Stock의 비동기 버전입니다. """
+
+import json
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import Optional, Union
+
+import aiohttp
+
+from kis.auth import (
+    KIS_APP_KEY,
+    KIS_APP_SECRET,
+    REFRESH_MARGIN,
+    load_token,
+    save_token,
+)
+from kis.cache import HistoryCache, history_cache
+from kis.client import (
+    KIS_URL,
+    KIS_TIMEOUT,
+    KIS_POOL_SIZE,
+    KIS_RETRIES,
+    RETRY_STATUS,
+    retry_delay,
+)
+from kis.get import Stock, StockExchange, daynight, daytime_exchange_codes
+from kis.limit import limiter
+from calc.math import StockAnalyzer
+from system.logger import log
+from system.metrics import metrics
+
+
+async def acquire(lock: threading.Lock, interval: float = 0.01):
+    """
+    - 이벤트 루프를 막지 않고 threading.Lock을 획득합니다.
+    - 스레드(Stock)와 코루틴(AsyncStock)이 같은 락(HistoryCache.lock)을 공유할 때 사용합니다.
+    """
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(interval)
+
+
+class AsyncClient:
+    """
+    - aiohttp 세션과 토큰 관리자를 묶은 비동기 KIS 클라이언트입니다.
+    - 하나의 클라이언트를 여러 AsyncStock이 공유하며, 호출 빈도는 kis.limit.limiter로 제한됩니다.
+    - async with AsyncClient() as client: 로 사용합니다.
+    """
+
+    def __init__(self, pool_size: int = KIS_POOL_SIZE, retries: int = KIS_RETRIES):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._token = None
+        self.expired = None
+        self._headers = None
+        self._token_lock = asyncio.Lock()
+        self._daynight_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=KIS_TIMEOUT),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def request(self, method: str, path: str, **kwargs) -> dict:
+        """
+        - 호출 빈도 제한을 지키며 요청을 보내고 응답 JSON을 반환합니다.
+        - kis.client._send와 같은 재시도 정책을 따릅니다.
+            - GET 요청은 연결 오류나 5xx/429 응답 시 지수 백오프로 재시도하고, 모두 실패하면 예외를 발생시킵니다.
+            - POST 요청은 재시도하지 않으며 오류 응답도 그 본문(JSON)을 그대로 반환합니다.
+        """
+        retries = self.retries if method == "GET" else 0
+        name = kwargs.get("headers", {}).get("tr_id") or path
+        for attempt in range(retries + 1):
+            await limiter.acquire_async()
+            start = time.perf_counter()
+            try:
+                async with self.session.request(
+                    method, f"{KIS_URL}{path}", **kwargs
+                ) as res:
+                    body = await res.read()
+            except aiohttp.ClientConnectionError:
+                metrics.record(f"http:{name}", time.perf_counter() - start, error=True)
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+            except Exception:
+                metrics.record(f"http:{name}", time.perf_counter() - start, error=True)
+                raise
+            metrics.record(
+                f"http:{name}",
+                time.perf_counter() - start,
+                error=res.status >= 400,
+                size=len(body),
+                retries=attempt,
+            )
+            if res.status in RETRY_STATUS and retries:
+                if attempt == retries:  # 재시도를 모두 실패한 경우
+                    res.raise_for_status()
+                await asyncio.sleep(
+                    retry_delay(attempt, res.headers.get("Retry-After"))
+                )
+                continue
+            with metrics.measure(f"json:{name}"):
+                return json.loads(body)
+
+    async def token(self) -> str:
+        """
+        - 유효한 토큰을 반환 / 동시에 여러 코루틴이 호출해도 발급은 한번만 일어납니다.
+        - kis.auth와 같은 토큰 파일을 사용하므로 동기 버전이 발급받은 토큰도 재사용합니다.
+        - 토큰 파일 I/O는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        async with self._token_lock:
+            if self._token is None or self.expired - REFRESH_MARGIN < datetime.now():
+                if saved := await asyncio.to_thread(load_token):
+                    self._token, self.expired = saved
+                else:
+                    token_info = await self.request(
+                        "POST",
+                        "/oauth2/tokenP",
+                        json={
+                            "grant_type": "client_credentials",
+                            "appkey": KIS_APP_KEY,
+                            "appsecret": KIS_APP_SECRET,
+                        },
+                    )
+                    self._token = token_info["access_token"]
+                    self.expired = datetime.strptime(
+                        token_info["access_token_token_expired"], "%Y-%m-%d %H:%M:%S"
+                    )
+                    await asyncio.to_thread(save_token, self._token, self.expired)
+                    log.info("[AsyncClient] 새로운 토큰이 발급되었습니다.")
+                self._headers = {
+                    "authorization": f"Bearer {self._token}",
+                    "appkey": KIS_APP_KEY,
+                    "appsecret": KIS_APP_SECRET,
+                }
+            return self._token
+
+    async def headers(self, tr_id: str, **extra) -> dict:
+        """kis.auth.auth.headers의 비동기 버전"""
+        await self.token()
+        return self._headers | {"tr_id": tr_id} | extra
+
+    async def get(self, request: dict) -> dict:
+        """Stock._history_request, Stock._current_request 형식의 요청을 보냅니다."""
+        return await self.request(
+            "GET",
+            request["path"],
+            headers=await self.headers(request["tr_id"]),
+            params=request["params"],
+        )
+
+    async def daynight_consider(self, exchange_code: str) -> str:
+        """kis.get.daynight_consider의 비동기 버전 / 동기 버전과 캐시를 공유합니다."""
+        if exchange_code not in daytime_exchange_codes:
+            return exchange_code
+        async with self._daynight_lock:
+            if (is_daytime := daynight.cached()) is None:
+                res = await self.request(
+                    "GET",
+                    "/uapi/overseas-stock/v1/trading/dayornight",
+                    headers=await self.headers("JTTT3010R"),
+                )
+                is_daytime = daynight.store(res)
+        return daytime_exchange_codes[exchange_code] if is_daytime else exchange_code
+
+
+class AsyncStock(Stock):
+    """
+    - analyzer, current가 코루틴인 Stock입니다. 반환 타입은 Stock과 같습니다.
+    - 페이지 요청과 파싱 로직은 Stock과 공유합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        code: str,
+        exchange: Union[StockExchange, str, None] = None,
+        client: AsyncClient,
+    ):
+        super().__init__(code=code, exchange=exchange)
+        self.client = client
+
+    async def _run(self, task):
+        """Stock._run의 비동기 버전"""
+        try:
+            ref_days = next(task)
+            while True:
+                exchange_code = await self.client.daynight_consider(self.exchange.code)
+                requests = [
+                    self._history_request(ref_day, exchange_code)
+                    for ref_day in ref_days
+                ]
+                pages = await asyncio.gather(*map(self.client.get, requests))
+                ref_days = task.send(pages)
+        except StopIteration as done:
+            return done.value
+
+    async def analyzer(
+        self,
+        max_size: int = 100,
+        ref_day: datetime = None,
+        cache: Optional[HistoryCache] = history_cache,
+    ) -> StockAnalyzer:
+        """
+        - Stock.analyzer 참고
+        - 캐시 파일 I/O(np.load, np.savez)는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        ref_day = ref_day or datetime.now()
+        if cache is None:
+            columns, _ = await self._run(self._collect(ref_day, max_size))
+        else:
+            lock = cache.lock(self.exchange.code, self.code)
+            await acquire(lock)
+            try:
+                cached = await asyncio.to_thread(
+                    cache.load, self.exchange.code, self.code
+                )
+                task = self._update_cache(cached, ref_day, max_size)
+                columns, complete = await self._run(task)
+                await asyncio.to_thread(
+                    cache.save, self.exchange.code, self.code, columns, complete
+                )
+            finally:
+                lock.release()
+        return self._window(columns, max_size, ref_day)
+
+    async def current(self) -> Optional[float]:
+        """현재 채결가"""
+        exchange_code = await self.client.daynight_consider(self.exchange.code)
+        res = await self.client.get(self._current_request(exchange_code))
+        return self._current_price(res)
+
+    def __repr__(self) -> str:
+        return f"<kis.aio.AsyncStock {self.code}/{self.exchange.code}>"
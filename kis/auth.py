@@ -1,64 +1,221 @@
 """ API 인증을 추상화합니다. """
 
 import os
-from datetime import datetime
-
-import requests
+import json
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from functools import cached_property
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
 
+from kis import client
+from kis.client import KIS_URL
 from system.logger import log
 
 KIS_APP_KEY = os.environ.get("KIS_APP_KEY")
 KIS_APP_SECRET = os.environ.get("KIS_APP_SECRET")
 KIS_CANO = os.environ.get("KIS_CANO")
 KIS_ACNT_PRDT_CD = os.environ.get("KIS_ACNT_PRDT_CD")
+# 발급받은 토큰을 저장하는 파일 / 재시작하거나 여러 프로세스가 실행되어도 토큰을 재사용합니다.
+KIS_TOKEN_FILE = Path(
+    os.environ.get("KIS_TOKEN_FILE", Path.home() / ".cache" / "ivot" / "token.json")
+)
+
+REFRESH_MARGIN = timedelta(minutes=10)  # 만료 시각보다 이만큼 먼저 토큰을 갱신합니다.
+HASH_CACHE_SIZE = 1024  # 캐싱할 hash key 수
+
+
+def _app_id() -> str:
+    """토큰 파일의 주인을 구분하기 위한 앱키 해시 (앱키를 그대로 저장하지 않습니다.)"""
+    return hashlib.sha256(f"{KIS_APP_KEY}:{KIS_URL}".encode()).hexdigest()
+
+
+def load_token() -> Optional[Tuple[str, datetime]]:
+    """저장된 (토큰, 만료 시각) / 없거나 다른 앱키의 토큰이거나 곧 만료되는 경우 None"""
+    try:
+        saved = json.loads(KIS_TOKEN_FILE.read_text())
+        expired = datetime.strptime(saved["expired"], "%Y-%m-%d %H:%M:%S")
+    except (OSError, ValueError, KeyError):
+        return None
+    if saved.get("app") != _app_id() or expired - REFRESH_MARGIN < datetime.now():
+        return None
+    return saved["token"], expired
+
+
+def save_token(token: str, expired: datetime):
+    """
+    - 다른 프로세스가 읽는 도중에 손상되지 않도록 임시 파일에 기록한 뒤 교체합니다.
+    - 임시 파일은 mkstemp로 만들므로 이름이 겹치지 않고 처음부터 소유자만 읽을 수 있습니다. (0600)
+    """
+    try:
+        KIS_TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(
+            dir=KIS_TOKEN_FILE.parent, prefix=f".{KIS_TOKEN_FILE.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(
+                    {
+                        "app": _app_id(),
+                        "token": token,
+                        "expired": expired.strftime("%Y-%m-%d %H:%M:%S"),
+                    },
+                    file,
+                )
+            os.replace(temp, KIS_TOKEN_FILE)
+        except BaseException:
+            os.unlink(temp)
+            raise
+    except OSError as error:
+        log.warning(f"토큰을 파일에 저장하지 못했습니다: {error!r}")
 
 
 class _OAuth:
+    """
+    - 인증 정보는 처음 사용할 때 발급받으므로 import 시점에는 네트워크 호출이 없습니다.
+    - 여러 스레드가 동시에 만료된 토큰을 만나도 발급(tokenP)은 한번만 일어나고 나머지는 기다립니다.
+    - 만료 REFRESH_MARGIN 전에 백그라운드 스레드가 토큰을 미리 갱신합니다.
+    - 토큰, 만료 시각, 공통 헤더는 하나의 튜플(_state)로 한번에 교체하므로
+      갱신 도중에 읽는 스레드도 항상 서로 맞는 값들을 봅니다.
+    """
+
     def __init__(self):
-        self.approval_key = requests.post(
-            url="https://openapi.koreainvestment.com:9443/oauth2/Approval",
+        self._state: Optional[Tuple[str, datetime, dict]] = (
+            None  # (토큰, 만료 시각, 공통 헤더)
+        )
+        self.lock = threading.Lock()
+        self._timer = None
+        self._hashes = OrderedDict()
+        self._hash_lock = threading.Lock()
+
+    @cached_property
+    def approval_key(self):
+        """웹소켓 접속키"""
+        return client.post(
+            path="/oauth2/Approval",
+            headers={},
             json={
                 "grant_type": "client_credentials",
                 "appkey": KIS_APP_KEY,
                 "secretkey": KIS_APP_SECRET,
             },
-        ).json()["approval_key"]
-        self.refresh()
+        )["approval_key"]
 
-    def refresh(self):
-        """토큰 갱신"""
-        token_info = requests.post(
-            url="https://openapi.koreainvestment.com:9443/oauth2/tokenP",
+    def _issue(self) -> Tuple[str, datetime]:
+        """토큰 파일에 유효한 토큰이 있으면 사용하고, 없으면 새로 발급받아 저장합니다."""
+        if saved := load_token():
+            return saved
+        token_info = client.post(
+            path="/oauth2/tokenP",
+            headers={},
             json={
                 "grant_type": "client_credentials",
                 "appkey": KIS_APP_KEY,
                 "appsecret": KIS_APP_SECRET,
             },
-        ).json()
-        self._token = token_info["access_token"]
-        self.expired = datetime.strptime(
+        )
+        token = token_info["access_token"]
+        expired = datetime.strptime(
             token_info["access_token_token_expired"], "%Y-%m-%d %H:%M:%S"
         )
+        save_token(token, expired)
+        log.info("새로운 토큰이 발급되었습니다.")
+        return token, expired
+
+    def refresh(self):
+        """토큰 갱신"""
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self):
+        token, expired = self._issue()
+        headers = {  # 토큰이 바뀔 때만 새로 만드는 공통 헤더
+            "authorization": f"Bearer {token}",
+            "appkey": KIS_APP_KEY,
+            "appsecret": KIS_APP_SECRET,
+        }
+        self._state = (token, expired, headers)
+        self._schedule(expired)
+
+    def _schedule(self, expired: datetime):
+        """만료 REFRESH_MARGIN 전에 refresh를 실행하도록 예약합니다."""
+        if self._timer:
+            self._timer.cancel()
+        delay = (expired - REFRESH_MARGIN - datetime.now()).total_seconds()
+        self._timer = threading.Timer(max(delay, 0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as error:  # 다음 token 접근 시 다시 시도합니다.
+            log.warning(f"토큰 사전 갱신 실패: {error!r}")
+
+    @staticmethod
+    def _valid(state: Optional[Tuple[str, datetime, dict]]) -> bool:
+        return state is not None and state[1] - REFRESH_MARGIN > datetime.now()
+
+    def _current(self) -> Tuple[str, datetime, dict]:
+        """유효한 (토큰, 만료 시각, 공통 헤더) / 만료된 경우 갱신합니다."""
+        state = self._state
+        if not self._valid(state):
+            with self.lock:
+                state = self._state
+                if not self._valid(
+                    state
+                ):  # 기다리는 동안 다른 스레드가 갱신했을 수 있음
+                    self._refresh()
+                    state = self._state
+        return state
+
+    @property
+    def expired(self) -> Optional[datetime]:
+        """현재 토큰의 만료 시각 / 아직 발급받지 않았으면 None"""
+        state = self._state
+        return None if state is None else state[1]
 
     @property
     def token(self):
         """유효한 토큰을 반환"""
-        if self.expired < datetime.now():
-            self.refresh()
-            log.info("토큰이 만료되어 새로운 토큰이 발급되었습니다.")
-        return self._token
+        return self._current()[0]
+
+    def headers(self, tr_id: str, **extra) -> dict:
+        """
+        - 유효한 토큰이 담긴 KIS API 요청 헤더를 반환합니다.
+        - extra: 추가할 헤더 (예: custtype="P")
+        """
+        return self._current()[2] | {"tr_id": tr_id} | extra
 
     def hash(self, post: dict):
-        """POST Request Body값 암호화에 필요한 hash key 생성"""
-        return requests.post(
-            url="https://openapi.koreainvestment.com:9443/uapi/hashkey",
+        """
+        - POST Request Body값 암호화에 필요한 hash key 생성
+        - 같은 Body의 hash key는 다시 요청하지 않습니다.
+        """
+        key = json.dumps(post, sort_keys=True, ensure_ascii=False)
+        with self._hash_lock:
+            if key in self._hashes:
+                self._hashes.move_to_end(key)
+                return self._hashes[key]
+
+        hash_key = client.post(
+            path="/uapi/hashkey",
             headers={
                 "content-Type": "application/json",
                 "appKey": KIS_APP_KEY,
                 "appSecret": KIS_APP_SECRET,
             },
             json=post,
-        ).json()["HASH"]
+        )["HASH"]
+
+        with self._hash_lock:
+            self._hashes[key] = hash_key
+            if len(self._hashes) > HASH_CACHE_SIZE:
+                self._hashes.popitem(last=False)
+        return hash_key
 
 
 auth = _OAuth()
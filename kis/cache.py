@@ -0,0 +1,86 @@
+""" 종목별 일봉 데이터를 로컬 디스크에 캐싱합니다. """
+
+import os
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+COLUMNS = ("date", "price", "low", "high", "open", "close", "tvol", "tamt")
+
+
+class HistoryCache:
+    """
+    - (거래소코드, 종목코드)별 일봉 데이터를 root/거래소코드/종목코드.npz 파일로 저장합니다.
+    - 각 파일은 과거 -> 현재 순서의 컬럼들(date: datetime64[D], 나머지: float64)과
+      상장일까지의 데이터를 모두 받았는지 여부(complete)를 담습니다.
+    - lock(거래소코드, 종목코드): 같은 종목의 load -> 갱신 -> save를 한 스레드씩 하도록 묶는 락
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def path(self, exchange_code: str, code: str) -> Path:
+        return self.root / exchange_code / f"{code}.npz"
+
+    def lock(self, exchange_code: str, code: str) -> threading.Lock:
+        """종목별 락 / 같은 종목에는 항상 같은 락을 반환합니다."""
+        with self._locks_lock:
+            key = (exchange_code, code)
+            if (lock := self._locks.get(key)) is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def load(
+        self, exchange_code: str, code: str
+    ) -> Optional[Tuple[Dict[str, np.ndarray], bool]]:
+        """
+        - (컬럼 dict, complete)를 반환합니다.
+        - 캐시가 없거나 손상되었거나 컬럼이 다른 이전 형식인 경우 None
+        """
+        path = self.path(exchange_code, code)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as file:
+                columns = {key: file[key] for key in COLUMNS}
+                complete = bool(file["complete"])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        return columns, complete
+
+    def save(
+        self,
+        exchange_code: str,
+        code: str,
+        columns: Dict[str, np.ndarray],
+        complete: bool,
+    ):
+        """
+        - 임시 파일에 기록한 뒤 교체하므로 기록 도중 중단되어도 기존 캐시가 손상되지 않습니다.
+        - 임시 파일 이름은 저장할 때마다 달라지므로 여러 스레드, 프로세스가 동시에 저장해도 됩니다.
+        """
+        path = self.path(exchange_code, code)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(
+                    file, complete=complete, **{key: columns[key] for key in COLUMNS}
+                )
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+
+history_cache = HistoryCache(
+    os.environ.get("KIS_CACHE_DIR", Path.home() / ".cache" / "ivot" / "history")
+)
@@ -0,0 +1,90 @@
+""" KIS API HTTP 연결을 추상화합니다. """
+
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from kis.limit import limiter
+from system.metrics import metrics
+
+KIS_URL = os.environ.get("KIS_URL", "https://openapi.koreainvestment.com:9443")
+KIS_TIMEOUT = float(os.environ.get("KIS_TIMEOUT", 10))  # 요청당 제한 시간(초)
+KIS_POOL_SIZE = int(os.environ.get("KIS_POOL_SIZE", 32))  # 유지할 keep-alive 연결 수
+
+# GET 요청은 5xx/429 응답이나 연결 오류 시 지수 백오프(0.5, 1, 2초)로 최대 KIS_RETRIES번 재시도합니다.
+# KIS는 호출 빈도 초과(EGW00201)도 500으로 응답하므로 재시도할 때마다 limiter 토큰을 다시 받습니다.
+# POST(주문 등)는 중복 실행될 수 있으므로 재시도하지 않습니다.
+KIS_RETRIES = int(os.environ.get("KIS_RETRIES", 3))
+RETRY_STATUS = (429, 500, 502, 503, 504)
+BACKOFF = 0.5
+
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=4, pool_maxsize=KIS_POOL_SIZE)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+
+def retry_delay(attempt: int, retry_after: str = None) -> float:
+    """attempt번째 재시도 전에 기다릴 시간(초) / Retry-After 헤더가 더 길면 그 값을 따릅니다."""
+    delay = BACKOFF * 2**attempt
+    try:
+        return max(delay, float(retry_after))
+    except (TypeError, ValueError):
+        return delay
+
+
+def _send(method: str, path: str, headers: dict, **kwargs) -> dict:
+    """
+    - 호출 빈도 제한(limiter)을 지키며 요청을 보내고 응답 JSON을 반환합니다.
+    - 재시도를 포함한 모든 요청이 limiter 토큰을 받습니다.
+    - 요청 시간, 응답 크기, 재시도 횟수는 "http:{tr_id}", JSON 파싱 시간은 "json:{tr_id}"
+      지표로 기록됩니다. (system.metrics 참고)
+    """
+    retries = KIS_RETRIES if method == "GET" else 0
+    name = headers.get("tr_id") or path
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            res = session.request(
+                method,
+                f"{KIS_URL}{path}",
+                headers=headers,
+                timeout=KIS_TIMEOUT,
+                **kwargs,
+            )
+        except requests.ConnectionError:
+            metrics.record(f"http:{name}", time.perf_counter() - start, error=True)
+            if attempt == retries:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+        except Exception:
+            metrics.record(f"http:{name}", time.perf_counter() - start, error=True)
+            raise
+        metrics.record(
+            f"http:{name}",
+            time.perf_counter() - start,
+            error=not res.ok,
+            size=len(res.content),
+            retries=attempt,
+        )
+        if res.status_code in RETRY_STATUS and retries:
+            if attempt == retries:  # 재시도를 모두 실패한 경우
+                res.raise_for_status()
+            time.sleep(retry_delay(attempt, res.headers.get("Retry-After")))
+            continue
+        with metrics.measure(f"json:{name}"):
+            return res.json()
+
+
+def get(path: str, headers: dict, params: dict = None) -> dict:
+    """호출 빈도 제한(limiter)을 지키며 GET 요청을 보내고 응답 JSON을 반환합니다."""
+    return _send("GET", path, headers, params=params)
+
+
+def post(path: str, headers: dict, json: dict) -> dict:
+    """호출 빈도 제한(limiter)을 지키며 POST 요청을 보내고 응답 JSON을 반환합니다."""
+    return _send("POST", path, headers, json=json)
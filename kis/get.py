@@ -1,335 +1,686 @@
-import pickle
-import requests
+import os
+import threading
 from pathlib import Path
-from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from kis.auth import KIS_APP_KEY, KIS_APP_SECRET, auth
+import numpy as np
+
+from kis import client
+from kis.auth import auth
+from kis.cache import COLUMNS, HistoryCache, history_cache
 from calc.math import StockAnalyzer
+from system.metrics import metrics
+
+KST = timezone(timedelta(hours=9))
+
+stocks_dir = Path(__file__).resolve().parent / "stocks"
 
 
-@dataclass
+@dataclass(eq=False, init=False)
 class StockExchange:
+    """
+    - currency: 거래 통화 / 다른 거래소와 가격을 비교할 때 사용합니다. (oer.normalize 참고)
+    - stocks: 정렬된 종목코드 배열
+        - 지정하면 정렬해서 사용합니다. (일부 종목만 담은 거래소를 만들 때 사용합니다.)
+        - 지정하지 않으면 처음 접근할 때 stocks_dir/{code}.npy 파일을 불러옵니다.
+          파일에는 종목코드가 고정폭 ASCII 바이트 배열로 저장되어 있습니다.
+    - `"META" in NAS` 와 같은 포함 여부 검사는 이진 탐색으로 처리됩니다.
+    """
+
     code: str
     name: str
-    stocks: List[str]
+    currency: str  # 거래 통화 (ISO 4217)
 
+    def __init__(
+        self, code: str, name: str, currency: str, stocks: Iterable[str] = None
+    ):
+        self.code = code
+        self.name = name
+        self.currency = currency
+        self._stocks = None
+        if stocks is not None:
+            self._stocks = np.sort(np.asarray(list(stocks), dtype=str))
+
+    @property
+    def stocks(self) -> np.ndarray:
+        if self._stocks is None:
+            codes = np.load(stocks_dir / f"{self.code}.npy", allow_pickle=False)
+            self._stocks = codes.astype(str)
+        return self._stocks
+
+    def __contains__(self, code: str) -> bool:
+        i = np.searchsorted(self.stocks, code)
+        return i < len(self.stocks) and self.stocks[i] == code
 
-stocks_dir = Path(__file__).resolve().parent / "stocks"
 
 exchange_list = [
     KRX := StockExchange(
         code="KRX",
         name="Korea Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "KRX.pickle").read_bytes()),
+        currency="KRW",
     ),
     HKS := StockExchange(
         code="HKS",
         name="Hong Kong Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "HKS.pickle").read_bytes()),
+        currency="HKD",
     ),
     NYS := StockExchange(
         code="NYS",
         name="New York Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "NYS.pickle").read_bytes()),
+        currency="USD",
     ),
     NAS := StockExchange(
         code="NAS",
         name="Nasdaq Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "NAS.pickle").read_bytes()),
+        currency="USD",
     ),
     AMS := StockExchange(
         code="AMS",
         name="Amex stock exchange",
-        stocks=pickle.loads((stocks_dir / "AMS.pickle").read_bytes()),
+        currency="USD",
     ),
     TSE := StockExchange(
         code="TSE",
         name="Tokyo Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "TSE.pickle").read_bytes()),
+        currency="JPY",
     ),
     SHS := StockExchange(
         code="SHS",
         name="Shanghai Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "SHS.pickle").read_bytes()),
+        currency="CNY",
     ),
     SZS := StockExchange(
         code="SZS",
         name="Shenzhen Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "SZS.pickle").read_bytes()),
+        currency="CNY",
     ),
     HSX := StockExchange(
         code="HSX",
         name="Ho Chi Minh City Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "HSX.pickle").read_bytes()),
+        currency="VND",
     ),
     HNX := StockExchange(
         code="HNX",
         name="Hanoi Stock Exchange",
-        stocks=pickle.loads((stocks_dir / "HNX.pickle").read_bytes()),
+        currency="VND",
     ),
 ]
 
 
+# 거래소코드 -> StockExchange (미국 주간거래 코드 포함)
+exchange_dict = {exchange.code: exchange for exchange in exchange_list} | {
+    "BAA": AMS,
+    "BAQ": NAS,
+    "BAY": NYS,
+}
+
+
+def resolve_exchange(exchange: Union[StockExchange, str]) -> StockExchange:
+    """거래소코드(미국 주간거래 코드 포함) 또는 StockExchange를 StockExchange로 변환합니다."""
+    if isinstance(exchange, StockExchange):
+        return exchange
+    try:
+        return exchange_dict[exchange]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 거래소입니다: {exchange}") from None
+
+
+class _DayNight:
+    """
+    - 미국 주간거래(dayornight API) 여부를 다음 세션 경계 시각까지 캐싱합니다.
+    - 주간거래 시간은 한국시간 10:00~18:00 (서머타임 09:00~17:00) 이므로
+      이 시각들을 경계로 사용하며, 경계를 지나면 다시 조회합니다.
+    - 여러 스레드가 동시에 만료된 캐시를 만나도 API 호출은 한번만 일어납니다.
+    """
+
+    boundaries = (9, 10, 17, 18)  # 한국시간(시)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._is_daytime = None
+        self.expires = None
+
+    def next_boundary(self, now: datetime) -> datetime:
+        """now 이후 가장 가까운 세션 경계 시각"""
+        for day in (now, now + timedelta(days=1)):
+            for hour in self.boundaries:
+                candidate = day.replace(hour=hour, minute=0, second=0, microsecond=0)
+                if candidate > now:
+                    return candidate
+
+    def cached(self) -> Optional[bool]:
+        """캐시된 주간거래 여부 / 캐시가 없거나 만료된 경우 None"""
+        if self._is_daytime is None or datetime.now(KST) >= self.expires:
+            return None
+        return self._is_daytime
+
+    def store(self, res: dict) -> bool:
+        """dayornight API 응답을 캐싱하고 주간거래 여부를 반환합니다."""
+        self._is_daytime = res["output"]["PSBL_YN"] == "N"
+        self.expires = self.next_boundary(datetime.now(KST))
+        return self._is_daytime
+
+    def is_daytime(self) -> bool:
+        with self.lock:
+            if (is_daytime := self.cached()) is not None:
+                return is_daytime
+            res = client.get(
+                path="/uapi/overseas-stock/v1/trading/dayornight",
+                headers=auth.headers("JTTT3010R"),
+            )
+            return self.store(res)
+
+    def invalidate(self):
+        """캐시를 비워서 다음 호출 때 다시 조회하도록 합니다."""
+        with self.lock:
+            self._is_daytime = None
+
+
+daynight = _DayNight()
+
+
+# 각 거래소의 주간 거래소
+daytime_exchange_codes = {"AMS": "BAA", "NAS": "BAQ", "NYS": "BAY"}
+
+
 def daynight_consider(exchange_code: str):
     """exchange_code가 NAS/AMS/NYS 중 하나인 경우 주간 야간을 고려한 거래소 코드를 반환합니다."""
 
-    exc_codes = {"AMS": "BAA", "NAS": "BAQ", "NYS": "BAY"}  # 각 거래소의 주간 거래소
+    exc_codes = daytime_exchange_codes
     if exchange_code not in exc_codes.keys():
         return exchange_code
 
-    res = requests.get(
-        url="https://openapi.koreainvestment.com:9443/uapi/overseas-stock/v1/trading/dayornight",
-        headers={
-            "authorization": f"Bearer {auth.token}",
-            "appkey": KIS_APP_KEY,
-            "appsecret": KIS_APP_SECRET,
-            "tr_id": "JTTT3010R",
-        },
-    )
-    is_daytime = True if res.json()["output"]["PSBL_YN"] == "N" else False
-    return exc_codes[exchange_code] if is_daytime else exchange_code
+    return exc_codes[exchange_code] if daynight.is_daytime() else exchange_code
 
 
-class Stock:
-    class _IncompleteIteration(Exception):
-        """클래스 내부적으로 사용되는 미완료 여부 감지용 예외 클래스"""
+def yyyymmdd_to_date(values: np.ndarray) -> np.ndarray:
+    """yyyymmdd 형식의 정수 배열을 datetime64[D] 배열로 변환합니다."""
+    years = (values // 10000 - 1970).astype("datetime64[Y]")
+    months = years.astype("datetime64[M]") + (values // 100 % 100 - 1)
+    return months.astype("datetime64[D]") + (values % 100 - 1)
 
-    def __init__(self, *, code: str, exchange: StockExchange):
-        self.code = code
-        self.exchange = exchange
-        self._history_iter = (
-            self._domestic_history_iter
-            if exchange is KRX
-            else self._overseas_history_iter
-        )
 
-    def _domestic_history_iter(self, ref_day: datetime):
+PAGE_SIZE = 100  # 한번의 요청으로 받는 최대 데이터 수
+PAGE_STEP = 130  # 100 거래일이 걸쳐 있는 최소 일수(약 140일)보다 약간 짧은 간격
+PAGE_BATCH = 8  # 한번에 동시에 요청하는 최대 페이지 수
+
+page_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("KIS_PAGE_WORKERS", PAGE_BATCH))
+)
+
+
+class Stock:
+    def __init__(self, *, code: str, exchange: Union[StockExchange, str, None] = None):
         """
-        - ref_day로부터 최대 100개의 과거 데이터를 이터레이션합니다.
-        - 국내(KRX)거래소 조회 시 사용됩니다.
+        - exchange: StockExchange 또는 거래소코드 문자열 ("NAS" 등)
+            - 생략하면 종목코드가 상장된 거래소를 kis.index.SymbolIndex에서 찾습니다.
         """
-        res = requests.get(
-            url="https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
-            headers={
-                "authorization": f"Bearer {auth.token}",
-                "appkey": KIS_APP_KEY,
-                "appsecret": KIS_APP_SECRET,
-                "tr_id": "FHKST03010100",
-            },
-            params={
-                "FID_COND_MRKT_DIV_CODE": "J",  # J=주식
-                "FID_INPUT_ISCD": self.code,
-                "FID_INPUT_DATE_1": datetime(  # 시작일: ref_day - 1년
-                    year=ref_day.year - 1, month=ref_day.month, day=ref_day.day
-                ).strftime("%Y%m%d"),
-                "FID_INPUT_DATE_2": ref_day.strftime("%Y%m%d"),
-                "FID_PERIOD_DIV_CODE": "D",  # 일봉
-                "FID_ORG_ADJ_PRC": "1",  # 원주가
-            },
-        ).json()
-        for ele in res["output2"]:
-            if not ele["stck_clpr"]:
-                raise self._IncompleteIteration
-            clos = float(ele["stck_clpr"])
-            low = float(ele["stck_lwpr"])
-            high = float(ele["stck_hgpr"])
-            typical_price = (clos + low + high) / 3
-            yield {
-                "date": datetime.strptime(ele["stck_bsop_date"], "%Y%m%d"),
-                "price": typical_price,
-                "low": low,
-                "high": high,
-                "tvol": float(ele["acml_vol"]),
-                "tamt": float(ele["acml_tr_pbmn"]),
-            }
-
-    def _overseas_history_iter(self, ref_day: datetime):
+        self.code = str(code)  # numpy 문자열(np.str_)도 허용
+        if exchange is None:
+            from kis.index import symbol_index  # 순환 import 방지
+
+            exchanges = symbol_index().exchanges(self.code)
+            if len(exchanges) != 1:
+                raise ValueError(
+                    f"{self.code}의 거래소를 하나로 정할 수 없습니다: "
+                    f"{[exchange.code for exchange in exchanges]}"
+                )
+            exchange = exchanges[0]
+        self.exchange = resolve_exchange(exchange)
+
+    def _history_request(self, ref_day: datetime, exchange_code: str) -> dict:
         """
-        - ref_day로부터 최대 100개의 과거 데이터를 이터레이션합니다.
-        - 해외 거래소 조회 시 사용됩니다.
+        - ref_day로부터 최대 100개의 과거 데이터를 요청하는 (path, tr_id, params)
+        - exchange_code: 주간 야간을 고려한 거래소 코드 (해외 거래소 조회 시 사용됩니다.)
         """
-        res = requests.get(
-            url="https://openapi.koreainvestment.com:9443/uapi/overseas-price/v1/quotations/dailyprice",
-            headers={
-                "authorization": f"Bearer {auth.token}",
-                "appkey": KIS_APP_KEY,
-                "appsecret": KIS_APP_SECRET,
-                "tr_id": "HHDFS76240000",
-            },
-            params={
+        if self.exchange is KRX:
+            return {
+                "path": "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+                "tr_id": "FHKST03010100",
+                "params": {
+                    "FID_COND_MRKT_DIV_CODE": "J",  # J=주식
+                    "FID_INPUT_ISCD": self.code,
+                    "FID_INPUT_DATE_1": datetime(  # 시작일: ref_day - 1년
+                        year=ref_day.year - 1, month=ref_day.month, day=ref_day.day
+                    ).strftime("%Y%m%d"),
+                    "FID_INPUT_DATE_2": ref_day.strftime("%Y%m%d"),
+                    "FID_PERIOD_DIV_CODE": "D",  # 일봉
+                    "FID_ORG_ADJ_PRC": "1",  # 원주가
+                },
+            }
+        return {
+            "path": "/uapi/overseas-price/v1/quotations/dailyprice",
+            "tr_id": "HHDFS76240000",
+            "params": {
                 "AUTH": "",
-                "EXCD": daynight_consider(self.exchange.code),
+                "EXCD": exchange_code,
                 "SYMB": self.code,
                 "GUBN": 0,  # 0:일, 1:주, 2:월
                 "BYMD": ref_day.strftime("%Y%m%d"),
                 "MODP": 0,
             },
-        ).json()
-        for ele in res["output2"]:
-            if not ele["clos"]:
-                raise self._IncompleteIteration
-            clos = float(ele["clos"])
-            low = float(ele["low"])
-            high = float(ele["high"])
-            typical_price = (clos + low + high) / 3
-            yield {
-                "date": datetime.strptime(ele["xymd"], "%Y%m%d"),
-                "price": typical_price,
-                "low": low,
-                "high": high,
-                "tvol": float(ele["tvol"]),
-                "tamt": float(ele["tamt"]),
-            }
-
-    def analyzer(self, max_size: int = 100, ref_day: datetime = datetime.now()):
-        """ref_day로부터 최대 max_size만큼의 과거 데이터가 담긴 StockAnalyzer를 생성하여 반환합니다."""
+        }
 
-        bucket = defaultdict(list)  # 이터레이션 값이 누적되는 객체
-        it = self._history_iter(ref_day)
-
-        while len(bucket["date"]) < max_size:
-            try:
-                current = next(it)
-                for key, value in current.items():
-                    bucket[key].append(value)
-            except StopIteration:
-                for data in bucket.values():
-                    del data[-1]  # 이전 호출 마지막과 다음 호출 처음이 겹치므로 제거
-                # 마지막 날짜를 처음으로 해서 다시 호출
-                it = self._history_iter(current["date"])
-            except self._IncompleteIteration:  # max_size를 다 채울 수 없음
-                break
-
-        for key in bucket:  # 데이터를 과거 -> 현재 순서대로 정렬합니다.
-            bucket[key].reverse()
+    def _history_page(self, res: dict) -> Tuple[Dict[str, np.ndarray], bool]:
+        """
+        - _history_request 응답을 최신 -> 과거 순서의 컬럼 배열 dict로 변환합니다.
+          (date: datetime64[D], 나머지: float64)
+        - 각 컬럼은 행 수만큼 미리 할당된 배열에 바로 채워지며 행마다 dict를 만들지 않습니다.
+        - (컬럼 dict, 더 이상 과거 데이터가 없는지 여부)를 반환합니다.
+        """
+        if self.exchange is KRX:
+            keys = ("stck_bsop_date", "stck_clpr", "stck_lwpr", "stck_hgpr")
+            keys += ("stck_oprc", "acml_vol", "acml_tr_pbmn")
+        else:
+            keys = ("xymd", "clos", "low", "high", "open", "tvol", "tamt")
+        date_key, clos_key, low_key, high_key, open_key, tvol_key, tamt_key = keys
+
+        rows = res["output2"]
+        # 상장일 이전 구간의 행들은 빈 값으로 채워져 있습니다.
+        size = next((i for i, ele in enumerate(rows) if not ele[clos_key]), len(rows))
+        rows = rows[:size]
+
+        def column(key: str, dtype=np.float64) -> np.ndarray:
+            return np.fromiter((ele[key] for ele in rows), dtype, count=size)
+
+        clos, low, high = column(clos_key), column(low_key), column(high_key)
+        columns = {
+            "date": yyyymmdd_to_date(column(date_key, np.int64)),
+            "price": (clos + low + high) / 3,  # typical price
+            "low": low,
+            "high": high,
+            "open": column(open_key),
+            "close": clos,
+            "tvol": column(tvol_key),
+            "tamt": column(tamt_key),
+        }
+        if self.exchange is KRX:
+            # 빈 값 행 없이 짧은 페이지가 옵니다. 요청 구간(1년)은 항상 PAGE_SIZE개 이상의 거래일이므로
+            # PAGE_SIZE개보다 적으면 상장일에 도달한 것입니다. (마지막 페이지 다음은 빈 output2)
+            return columns, size < PAGE_SIZE
+        return columns, size < len(res["output2"])
+
+    def _fetch(self, ref_day: datetime) -> dict:
+        """ref_day로부터 최대 100개의 과거 데이터를 요청합니다."""
+        request = self._history_request(ref_day, daynight_consider(self.exchange.code))
+        return client.get(
+            path=request["path"],
+            headers=auth.headers(request["tr_id"]),
+            params=request["params"],
+        )
 
-        return StockAnalyzer(code=self.code, exchange=self.exchange, **bucket)
+    def _run(self, task):
+        """
+        - _collect 계열 제너레이터가 yield한 날짜들의 데이터를 동시에 요청해서 send로 전달합니다.
+        - 제너레이터의 반환값을 반환합니다. (비동기 버전: kis.aio.AsyncStock._run)
+        """
+        try:
+            ref_days = next(task)
+            while True:
+                if len(ref_days) == 1:
+                    pages = [self._fetch(ref_days[0])]
+                else:
+                    pages = list(page_executor.map(self._fetch, ref_days))
+                ref_days = task.send(pages)
+        except StopIteration as done:
+            return done.value
+
+    def _collect(self, ref_day: datetime, max_size: float, until: datetime = None):
+        """
+        - ref_day로부터 과거 방향으로 최대 max_size개의 데이터를 수집합니다.
+        - until이 주어지면 until 이하의 날짜에 도달했을 때 수집을 멈춥니다.
+        - (과거 -> 현재 순서의 컬럼 dict, 상장일까지 모두 수집했는지 여부)를 반환합니다.
+        - 네트워크 요청은 하지 않는 제너레이터입니다.
+          필요한 페이지들의 기준일 리스트를 yield하고, 그 응답 리스트를 send로 받습니다. (_run 참고)
+        - 한 페이지(100개)는 항상 PAGE_STEP일 이상에 걸쳐 있으므로 기준일을 PAGE_STEP일씩
+          당겨서 여러 페이지를 동시에 요청해도 페이지 사이에 빈 구간이 생기지 않습니다.
+        """
+        capacity = max_size if max_size != float("inf") else PAGE_SIZE * PAGE_BATCH
+        buffer = {key: np.empty(capacity) for key in COLUMNS if key != "date"}
+        buffer["date"] = np.empty(capacity, dtype="datetime64[D]")
+        count = 0  # buffer의 뒤에서부터 최신 -> 과거 순서로 채웁니다.
+        boundary = np.datetime64(ref_day, "D") + 1  # 수집된 데이터 중 가장 과거 날짜
+        if until is not None:
+            until = np.datetime64(until, "D")
+        complete = done = False
+
+        while not done:
+            if until is not None:  # until까지의 거래일 수로 페이지 수를 추정합니다.
+                trading_days = (boundary - until).astype(int) * 5 / 7
+                pages = min(int(trading_days // PAGE_SIZE) + 1, PAGE_BATCH)
+            elif max_size != float("inf"):
+                pages = min(-(-(max_size - count) // PAGE_SIZE), PAGE_BATCH)
+            else:
+                pages = PAGE_BATCH
+            cursor = (boundary - 1).astype("datetime64[s]").item()
+            ref_days = [cursor - timedelta(days=PAGE_STEP * k) for k in range(pages)]
+            responses = yield ref_days
+
+            last_boundary = boundary
+            for page_ref, res in zip(ref_days, responses):
+                if np.datetime64(page_ref, "D") < boundary - 1:
+                    break  # 앞 페이지와 이어지지 않는 페이지는 다음 요청에서 다시 받습니다.
+                page, exhausted = self._history_page(res)
+                dates = page["date"]
+                start = np.count_nonzero(dates >= boundary)  # 앞 페이지와 겹치는 데이터
+                end = len(dates)
+                if until is not None:  # until 이하의 날짜는 제외하고 수집을 멈춥니다.
+                    end = np.count_nonzero(dates > until)
+                    done = end < len(dates)
+                if end - start >= max_size - count:
+                    end = start + int(max_size - count)
+                    done = True
+                if (size := end - start) > 0:
+                    if count + size > capacity:  # 버퍼를 두배 이상으로 늘립니다.
+                        grown_capacity = max(capacity * 2, count + size)
+                        for key, values in buffer.items():
+                            grown = np.empty(grown_capacity, dtype=values.dtype)
+                            grown[grown_capacity - count :] = values[capacity - count :]
+                            buffer[key] = grown
+                        capacity = grown_capacity
+                    fill = slice(capacity - count - size, capacity - count)
+                    # 과거 -> 최신 순서로 뒤집어서 복사
+                    for key, values in page.items():
+                        buffer[key][fill] = values[start:end][::-1]
+                    count += size
+                    boundary = dates[end - 1]
+                if exhausted and not done:  # 더 이상 과거 데이터가 없음
+                    complete = done = True
+                if done:
+                    break
+            if boundary == last_boundary and not done:
+                complete = done = True  # 더 이상 받을 수 있는 과거 데이터가 없음
+
+        columns = {key: values[capacity - count :] for key, values in buffer.items()}
+        return columns, complete
+
+    def _update_cache(
+        self,
+        cached: Optional[Tuple[Dict[str, np.ndarray], bool]],
+        ref_day: datetime,
+        max_size: int,
+    ):
+        """
+        - cached(HistoryCache.load의 반환값)에 없는 최신 데이터와,
+          ref_day 기준으로 부족한 과거 데이터만 받아서 합칩니다.
+        - (갱신된 컬럼 dict, complete)를 반환합니다.
+        - _collect와 같은 방식의 제너레이터이며 캐시 파일은 읽고 쓰지 않습니다. (analyzer 참고)
+        """
+        if cached is None:
+            columns, complete = yield from self._collect(datetime.now(), max_size)
+        else:
+            columns, complete = cached
+            # 마지막 캐시 데이터는 장중에 저장되었을 수 있으므로 그 날짜부터 다시 받아서 교체합니다.
+            until = None
+            if len(columns["date"]):
+                until = columns["date"][-1] - 1
+            newer, _ = yield from self._collect(
+                datetime.now(), float("inf"), until=until
+            )
+            if len(newer["date"]):
+                keep = columns["date"] < newer["date"][0]
+                columns = {
+                    key: np.concatenate([columns[key][keep], newer[key]])
+                    for key in COLUMNS
+                }
+
+        older = np.count_nonzero(columns["date"] <= np.datetime64(ref_day, "D"))
+        if older < max_size and not complete and len(columns["date"]):
+            # 가장 오래된 날짜 이전부터 이어서 부족한 만큼 받습니다.
+            first = columns["date"][0].astype("datetime64[s]").item()
+            if ref_day < first:  # ref_day까지의 공백을 먼저 채웁니다.
+                gap, complete = yield from self._collect(
+                    first - timedelta(days=1), float("inf"), until=ref_day
+                )
+                columns = {
+                    key: np.concatenate([gap[key], columns[key]]) for key in COLUMNS
+                }
+                first = ref_day + timedelta(days=1)
+            if not complete:
+                prev, complete = yield from self._collect(
+                    first - timedelta(days=1), max_size - older
+                )
+                columns = {
+                    key: np.concatenate([prev[key], columns[key]]) for key in COLUMNS
+                }
+
+        return columns, complete
+
+    def _window(
+        self, columns: Dict[str, np.ndarray], max_size: int, ref_day: datetime
+    ) -> StockAnalyzer:
+        """ref_day 이하의 최근 max_size개 데이터로 StockAnalyzer를 만듭니다."""
+        end = np.searchsorted(columns["date"], np.datetime64(ref_day, "D"), "right")
+        start = max(end - max_size, 0)
+        columns = {key: values[start:end] for key, values in columns.items()}
+        return StockAnalyzer(code=self.code, exchange=self.exchange, **columns)
+
+    @metrics.timed("kis.Stock.analyzer")
+    def analyzer(
+        self,
+        max_size: int = 100,
+        ref_day: datetime = None,
+        cache: Optional[HistoryCache] = history_cache,
+    ):
+        """
+        - ref_day로부터 최대 max_size만큼의 과거 데이터가 담긴 StockAnalyzer를 생성하여 반환합니다.
+        - ref_day: default=현재
+        - cache: 일봉 데이터 캐시 / None이면 캐시를 사용하지 않고 모든 데이터를 새로 받습니다.
+            - 같은 종목의 캐시 갱신(load -> 요청 -> save)은 종목별 락으로 한번에 하나씩 진행됩니다.
+        """
+        ref_day = ref_day or datetime.now()
+        if cache is None:
+            columns, _ = self._run(self._collect(ref_day, max_size))
+        else:
+            with cache.lock(self.exchange.code, self.code):
+                cached = cache.load(self.exchange.code, self.code)
+                task = self._update_cache(cached, ref_day, max_size)
+                columns, complete = self._run(task)
+                cache.save(self.exchange.code, self.code, columns, complete)
+        return self._window(columns, max_size, ref_day)
+
+    def _current_request(self, exchange_code: str) -> dict:
+        """현재 체결가를 요청하는 (path, tr_id, params)"""
+        if self.exchange is KRX:
+            return {
+                "path": "/uapi/domestic-stock/v1/quotations/inquire-price",
+                "tr_id": "FHKST01010100",
+                "params": {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": self.code},
+            }
+        return {
+            "path": "/uapi/overseas-price/v1/quotations/price",
+            "tr_id": "HHDFS00000300",
+            "params": {"AUTH": "", "EXCD": exchange_code, "SYMB": self.code},
+        }
+
+    def _current_price(self, res: dict) -> Optional[float]:
+        """_current_request 응답에서 현재 체결가를 꺼냅니다."""
+        price = res["output"]["stck_prpr" if self.exchange is KRX else "last"]
+        return float(price) if price else None
 
     def current(self):
         """현재 채결가"""
-        if self.exchange is KRX:
-            res = requests.get(
-                url="https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-price",
-                headers={
-                    "authorization": f"Bearer {auth.token}",
-                    "appkey": KIS_APP_KEY,
-                    "appsecret": KIS_APP_SECRET,
-                    "tr_id": "FHKST01010100",
-                },
-                params={
-                    "FID_COND_MRKT_DIV_CODE": "J",
-                    "FID_INPUT_ISCD": self.code,
-                },
-            ).json()
-            price = res["output"]["stck_prpr"]
-        else:
-            res = requests.get(
-                url="https://openapi.koreainvestment.com:9443/uapi/overseas-price/v1/quotations/price",
-                headers={
-                    "authorization": f"Bearer {auth.token}",
-                    "appkey": KIS_APP_KEY,
-                    "appsecret": KIS_APP_SECRET,
-                    "tr_id": "HHDFS00000300",
-                },
-                params={
-                    "AUTH": "",
-                    "EXCD": daynight_consider(self.exchange.code),
-                    "SYMB": self.code,
-                },
-            ).json()
-            price = res["output"]["last"]
-        return float(price) if price else None
+        request = self._current_request(daynight_consider(self.exchange.code))
+        res = client.get(
+            path=request["path"],
+            headers=auth.headers(request["tr_id"]),
+            params=request["params"],
+        )
+        return self._current_price(res)
 
     def __repr__(self) -> str:
         return f"<kis.get.Stock {self.code}/{self.exchange.code}>"
 
 
-def cond_search_api_call(params: dict) -> List[StockAnalyzer]:
-    """해외주식 조건검색 API call 함수"""  #! 국내주식도 적용해서 업데이트
-    analyzers = []
+# 조건검색 API가 지원하는 거래소 목록 #! 국내주식도 적용해서 업데이트
+search_exchanges = [exchange for exchange in exchange_list if exchange is not KRX]
 
-    for exc_code in exchange_list:
-        res = requests.get(
-            url="https://openapi.koreainvestment.com:9443/uapi/overseas-price/v1/quotations/inquire-search",
-            headers={
-                "authorization": f"Bearer {auth.token}",
-                "appkey": KIS_APP_KEY,
-                "appsecret": KIS_APP_SECRET,
-                "tr_id": "HHDFS76410000",
-                "custtype": "P",
-            },
-            params={"AUTH": "", "EXCD": exc_code} | params,
-        ).json()
-        for data in res["output2"]:
-            analyzers.append(Stock(exchange=data["excd"], code=data["symb"]).analyzer())
 
-    return analyzers
+def _search(params: dict, exchange: StockExchange) -> List[Tuple[str, str]]:
+    """한 거래소에 대해 조건검색을 실행하고 (거래소코드, 종목코드) 리스트를 반환합니다."""
+    res = client.get(
+        path="/uapi/overseas-price/v1/quotations/inquire-search",
+        headers=auth.headers("HHDFS76410000", custtype="P"),
+        params={"AUTH": "", "EXCD": exchange.code} | params,
+    )
+    return [(data["excd"], data["symb"]) for data in res["output2"]]
+
+
+def search_stocks(
+    queries: List[dict], exchanges: List[StockExchange] = search_exchanges
+) -> List[Stock]:
+    """
+    - 모든 (조건, 거래소) 조합을 동시에 검색합니다.
+    - 여러 조건에 중복으로 걸린 종목은 한번만 포함된 Stock 리스트를 반환합니다.
+    """
+    jobs = [(params, exchange) for params in queries for exchange in exchanges]
+    with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as executor:
+        hits = executor.map(lambda job: _search(*job), jobs)
+
+    stocks = {}  # 검색 순서를 유지하며 중복을 제거합니다.
+    for exchange_code, code in (hit for result in hits for hit in result):
+        if (exchange := exchange_dict.get(exchange_code)) is None:
+            continue  # 지원하지 않는 거래소
+        stocks.setdefault((exchange.code, code), Stock(exchange=exchange, code=code))
+    return list(stocks.values())
+
+
+def cond_search_api_call(params: dict, max_size: int = 100) -> Iterator[StockAnalyzer]:
+    """
+    - 해외주식 조건검색 API call 함수
+    - 검색은 즉시 실행되지만 각 종목의 과거 데이터는 이터레이션할 때 하나씩 받습니다.
+    """
+    stocks = search_stocks([params])
+    return (stock.analyzer(max_size=max_size) for stock in stocks)
+
+
+def _intersect(a: dict, b: dict) -> Optional[dict]:
+    """
+    - 두 검색 조건을 모두 만족하는 하나의 검색 조건
+    - 같은 항목의 범위가 겹치면 시작값(CO_ST_*)은 큰 값, 끝값(CO_EN_*)은 작은 값을 사용합니다.
+    - 겹치는 범위가 없으면 None
+    """
+    params = a | b
+    for key in a.keys() & b.keys():
+        if key.startswith("CO_ST_"):
+            params[key] = max(a[key], b[key], key=float)
+        elif key.startswith("CO_EN_"):
+            params[key] = min(a[key], b[key], key=float)
+    for key in params:
+        if key.startswith("CO_ST_") and (end := "CO_EN_" + key[6:]) in params:
+            if float(params[key]) > float(params[end]):
+                return None
+    return params
+
+
+class Screen:
+    """
+    - 해외주식 조건검색 조건입니다. 조건 함수들(per, eps ...)이 반환합니다.
+    - a & b: 두 조건을 모두 만족하는 종목 / 한번의 검색 API 호출로 처리됩니다.
+        - 같은 항목의 조건이 겹치면 범위의 교집합으로 검색합니다.
+    - a | b: 두 조건 중 하나라도 만족하는 종목 / 중복된 종목은 한번만 포함됩니다.
+    - 이터레이션하면 검색된 종목의 StockAnalyzer를 하나씩 생성합니다.
+    """
+
+    def __init__(self, params: dict, max_size: int = 100):
+        self.queries = [params]
+        self.max_size = max_size
+
+    def _combine(self, queries: List[dict]) -> "Screen":
+        screen = Screen({}, self.max_size)
+        screen.queries = queries
+        return screen
+
+    def __and__(self, other: "Screen") -> "Screen":
+        queries = (_intersect(a, b) for a in self.queries for b in other.queries)
+        return self._combine([params for params in queries if params is not None])
+
+    def __or__(self, other: "Screen") -> "Screen":
+        return self._combine(self.queries + other.queries)
+
+    def stocks(self) -> List[Stock]:
+        """과거 데이터 없이 검색된 종목만 반환합니다."""
+        return search_stocks(self.queries)
+
+    def __iter__(self) -> Iterator[StockAnalyzer]:
+        for stock in self.stocks():
+            yield stock.analyzer(max_size=self.max_size)
+
+    def __repr__(self) -> str:
+        return f"<kis.get.Screen {self.queries}>"
 
 
 def current_price(x1, x2):
     """가격 범위로 검색합니다."""
     params = {"CO_YN_PRICECUR": "1", "CO_ST_PRICECUR": x1, "CO_EN_PRICECUR": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def fluctuation_rate(x1, x2):
     """등락율 범위로 검색합니다."""
     params = {"CO_YN_RATE": "1", "CO_ST_RATE": x1, "CO_EN_RATE": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def trading_volume(x1, x2):
     """거래량 범위로 검색합니다."""
     params = {"CO_YN_VOLUME": "1", "CO_ST_VOLUME": x1, "CO_EN_VOLUME": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def trading_price(x1, x2):
     """거래대금 범위로 검색합니다."""
     params = {"CO_YN_AMT": "1", "CO_ST_AMT": x1, "CO_EN_AMT": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def per(x1, x2):
     """PER(주가수익비율) 범위로 검색합니다."""
     params = {"CO_YN_PER": "1", "CO_ST_PER": x1, "CO_EN_PER": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def eps(x1, x2):
     """EPS(주당순이익) 범위로 검색합니다."""
     params = {"CO_YN_EPS": "1", "CO_ST_EPS": x1, "CO_EN_EPS": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def shares_amount(x1, x2):
     """발행 주식 수 범위로 검색합니다."""
     params = {"CO_YN_SHAR": "1", "CO_ST_SHAR": x1, "CO_EN_SHAR": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
 def market_capitalization(x1, x2):
     """기업 시가총액 범위로 검색합니다."""
     params = {"CO_YN_VALX": "1", "CO_ST_VALX": x1, "CO_EN_VALX": x2}
-    return cond_search_api_call(params)
+    return Screen(params)
 
 
-def all(target_exchanges: List[StockExchange] = exchange_list) -> List[StockAnalyzer]:
+def all(
+    target_exchanges: List[StockExchange] = exchange_list,
+    *,
+    max_size: int = 100,
+    workers: int = 8,
+    on_progress: Optional[Callable] = None,
+    on_error: Optional[Callable] = None,
+) -> List[StockAnalyzer]:
     """
     - 증권 거래소의 모든 주식을 StockAnalyzer로 불러옵니다.
     - target_exchanges: 거래소 리스트 / default=모든 거래소
+    - workers: 동시에 불러오는 스레드 수
+    - on_progress, on_error: kis.loader.UniverseLoader 참고 / on_progress default=진행률 출력
     """
-    analyzers = []
-    for exchange in target_exchanges:
-        for cnt, code in enumerate(exchange.stocks):
-            print("")
-            analyzers.append(Stock(exchange=exchange, code=code).analyzer())
-            print(
-                f"[get.all] loading {exchange}: {cnt/len(exchange.stocks) * 100:.3f}%",
-                end="\r",
-            )
-        print(f"[get.all] {exchange} loading complete")
-    return analyzers
+    from kis.loader import UniverseLoader, print_progress  # 순환 import 방지
+
+    loader = UniverseLoader(
+        workers=workers,
+        max_size=max_size,
+        on_progress=on_progress or print_progress,
+        on_error=on_error,
+    )
+    return loader.load(target_exchanges)
@@ -0,0 +1,82 @@
+""" 모든 거래소의 종목코드 인덱스 """
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kis.get import StockExchange, exchange_list
+
+
+class SymbolIndex:
+    """
+    - 모든 거래소의 종목코드를 하나로 합친 정렬된 배열입니다.
+        - kis/stocks/*.npy 종목 목록들을 합쳐서 정렬하는 데 몇 ms면 되므로 인덱스 파일은 따로 두지 않습니다.
+        - codes[i]: 종목코드 / exchange_ids[i]: 그 종목이 상장된 거래소의 exchange_list 인덱스
+        - 여러 거래소에 같은 종목코드가 있으면 인접한 여러 항목이 됩니다.
+    - exchanges(code): 종목코드 -> 상장된 거래소 리스트 (dict 조회)
+    - search(prefix): 종목코드가 prefix로 시작하는 종목들 (이진 탐색)
+    """
+
+    def __init__(self, codes: np.ndarray, exchange_ids: np.ndarray):
+        self.codes = codes
+        self.exchange_ids = exchange_ids
+        self._lookup: Optional[Dict[str, Tuple[StockExchange, ...]]] = None
+
+    @classmethod
+    def build(cls) -> "SymbolIndex":
+        """kis/stocks/*.npy 종목 목록들로 인덱스를 만듭니다."""
+        stocks = [exchange.stocks for exchange in exchange_list]
+        codes = np.concatenate(stocks)
+        exchange_ids = np.repeat(
+            np.arange(len(exchange_list), dtype=np.int8), [len(s) for s in stocks]
+        )
+        order = np.argsort(codes, kind="stable")
+        return cls(codes[order], exchange_ids[order])
+
+    @property
+    def lookup(self) -> Dict[str, Tuple[StockExchange, ...]]:
+        """종목코드 -> 상장된 거래소들 / 처음 사용할 때 만듭니다."""
+        if self._lookup is None:
+            lookup = {}
+            for code, exchange_id in zip(
+                self.codes.tolist(), self.exchange_ids.tolist()
+            ):
+                lookup[code] = lookup.get(code, ()) + (exchange_list[exchange_id],)
+            self._lookup = lookup
+        return self._lookup
+
+    def exchanges(self, code: str) -> Tuple[StockExchange, ...]:
+        """종목코드가 상장된 거래소들 / 없으면 빈 튜플"""
+        return self.lookup.get(str(code), ())
+
+    def search(self, prefix: str, limit: int = 20) -> List[Tuple[StockExchange, str]]:
+        """종목코드가 prefix로 시작하는 (거래소, 종목코드)를 종목코드 순서로 최대 limit개 반환합니다."""
+        start = np.searchsorted(self.codes, prefix, side="left")
+        end = np.searchsorted(self.codes, prefix + "\U0010ffff", side="left")
+        end = min(end, start + limit)
+        return [
+            (exchange_list[exchange_id], code)
+            for code, exchange_id in zip(
+                self.codes[start:end].tolist(), self.exchange_ids[start:end].tolist()
+            )
+        ]
+
+    def __contains__(self, code: str) -> bool:
+        return str(code) in self.lookup
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return f"<kis.index.SymbolIndex (symbols: {len(self)}, exchanges: {len(exchange_list)})>"
+
+
+_symbol_index: Optional[SymbolIndex] = None
+
+
+def symbol_index() -> SymbolIndex:
+    """전역 SymbolIndex / 처음 호출할 때 만듭니다."""
+    global _symbol_index
+    if _symbol_index is None:
+        _symbol_index = SymbolIndex.build()
+    return _symbol_index
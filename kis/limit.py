@@ -0,0 +1,46 @@
+""" API 호출 빈도 제한을 추상화합니다. """
+
+import os
+import asyncio
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    - 토큰 버킷 방식으로 초당 호출 횟수를 제한합니다.
+    - rate: 초당 채워지는 토큰 수
+    - capacity: 버킷 크기(순간적으로 허용되는 최대 호출 수)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        - 토큰을 예약하고, 예약한 토큰을 사용할 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+        - 먼저 예약한 호출이 먼저 실행되도록 토큰 수가 음수(대기열)가 될 수 있습니다.
+        """
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, tokens: float = 1):
+        """토큰을 얻을 때까지 대기합니다."""
+        time.sleep(self.reserve(tokens))
+
+    async def acquire_async(self, tokens: float = 1):
+        """토큰을 얻을 때까지 이벤트 루프를 막지 않고 대기합니다."""
+        await asyncio.sleep(self.reserve(tokens))
+
+
+# KIS 실전투자 REST API는 초당 20건으로 제한되므로 여유를 두고 설정합니다.
+limiter = TokenBucket(rate=float(os.environ.get("KIS_RATE_LIMIT", 18)))
@@ -0,0 +1,102 @@
+""" 여러 종목의 StockAnalyzer를 병렬로 불러옵니다. """
+
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+from calc.math import StockAnalyzer
+from kis.get import Stock, StockExchange
+from system.logger import log
+
+
+@dataclass
+class LoadReport:
+    """UniverseLoader.load 실행 결과 통계"""
+
+    total: int = 0  # 요청한 종목 수
+    loaded: int = 0  # 불러오기에 성공한 종목 수
+    # 실패한 (거래소코드, 종목코드) 리스트
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    elapsed: float = 0.0  # 소요 시간(초)
+
+    @property
+    def throughput(self) -> float:
+        """초당 처리한 종목 수 (symbols/s)"""
+        return self.loaded / self.elapsed if self.elapsed else 0.0
+
+
+def print_progress(exchange: StockExchange, code: str, done: int, total: int):
+    """터미널에 진행률을 출력하는 기본 on_progress 콜백"""
+    print(
+        f"[get.all] loading {exchange.code}/{code}: {done/total * 100:.3f}%", end="\r"
+    )
+
+
+class UniverseLoader:
+    """
+    - 여러 거래소의 종목들을 스레드 풀로 동시에 불러옵니다.
+    - HTTP 호출 빈도는 kis.limit.limiter가 전역으로 제한하므로 workers를 늘려도 KIS 제한을 넘지 않습니다.
+    - on_progress(exchange, code, done, total): 종목 하나가 처리될 때마다 호출됩니다.
+    - on_error(exchange, code, error): 종목 불러오기에 실패하면 호출됩니다.
+        - None이면 첫 에러에서 남은 작업을 취소하고 에러를 다시 발생시킵니다.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        max_size: int = 100,
+        on_progress: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ):
+        self.workers = workers
+        self.max_size = max_size
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.report = LoadReport()
+
+    def _load(self, exchange: StockExchange, code: str) -> StockAnalyzer:
+        return Stock(exchange=exchange, code=code).analyzer(max_size=self.max_size)
+
+    def load(self, exchanges: List[StockExchange]) -> List[StockAnalyzer]:
+        """거래소 리스트의 모든 종목을 불러와 입력 순서대로 반환합니다."""
+        return self.load_symbols(
+            [(exchange, code) for exchange in exchanges for code in exchange.stocks]
+        )
+
+    def load_symbols(
+        self, tasks: List[Tuple[StockExchange, str]]
+    ) -> List[StockAnalyzer]:
+        """(거래소, 종목코드) 리스트의 종목들을 불러와 입력 순서대로 반환합니다."""
+        results = [None] * len(tasks)
+        report = self.report = LoadReport(total=len(tasks))
+
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {
+                executor.submit(self._load, exchange, code): i
+                for i, (exchange, code) in enumerate(tasks)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                exchange, code = tasks[i]
+                try:
+                    results[i] = future.result()
+                    report.loaded += 1
+                except Exception as error:
+                    report.failed.append((exchange.code, code))
+                    if self.on_error is None:
+                        raise
+                    self.on_error(exchange, code, error)
+                if self.on_progress:
+                    self.on_progress(exchange, code, done, report.total)
+        finally:
+            executor.shutdown(cancel_futures=True)
+            report.elapsed = time.perf_counter() - start
+
+        log.info(
+            f"[UniverseLoader] {report.loaded}/{report.total} 종목 로딩 완료 "
+            f"(실패: {len(report.failed)}, {report.elapsed:.1f}초, {report.throughput:.2f} symbols/s)"
+        )
+        return [analyzer for analyzer in results if analyzer is not None]
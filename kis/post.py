@@ -0,0 +1,239 @@
+""" 주문을 추상화합니다. """
+
+import time
+import threading
+import itertools
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from kis import client
+from kis.auth import KIS_ACNT_PRDT_CD, KIS_CANO, auth
+from kis.get import KRX, StockExchange, resolve_exchange
+from system.logger import log
+
+# 거래소코드 -> (매수 tr_id, 매도 tr_id)
+order_tr_ids = {
+    "KRX": ("TTTC0802U", "TTTC0801U"),
+    "NAS": ("TTTT1002U", "TTTT1006U"),
+    "NYS": ("TTTT1002U", "TTTT1006U"),
+    "AMS": ("TTTT1002U", "TTTT1006U"),
+    "HKS": ("TTTS1002U", "TTTS1001U"),
+    "TSE": ("TTTS0308U", "TTTS0307U"),
+    "SHS": ("TTTS0202U", "TTTS1005U"),
+    "SZS": ("TTTS0305U", "TTTS0304U"),
+    "HSX": ("TTTS0311U", "TTTS0310U"),
+    "HNX": ("TTTS0311U", "TTTS0310U"),
+}
+
+# 거래소코드 -> 해외주식 주문 API의 거래소코드(OVRS_EXCG_CD)
+order_exchange_codes = {
+    "NAS": "NASD",
+    "NYS": "NYSE",
+    "AMS": "AMEX",
+    "HKS": "SEHK",
+    "TSE": "TKSE",
+    "SHS": "SHAA",
+    "SZS": "SZAA",
+    "HSX": "VNSE",
+    "HNX": "HASE",
+}
+
+_order_ids = itertools.count(1)
+
+
+@dataclass(eq=False)
+class Order:
+    """
+    - 지정가 주문 하나 / side: "buy" 또는 "sell"
+    - price가 0이면 시장가 주문입니다. (국내주식만 지원)
+    """
+
+    exchange: Union[StockExchange, str]
+    code: str
+    side: str
+    quantity: int
+    price: float = 0
+    id: int = field(default_factory=lambda: next(_order_ids))
+
+    def __post_init__(self):
+        self.exchange = resolve_exchange(self.exchange)
+        if self.side not in ("buy", "sell"):
+            raise ValueError(f"side는 buy 또는 sell이어야 합니다: {self.side}")
+        if self.exchange.code not in order_tr_ids:
+            raise ValueError(f"주문을 지원하지 않는 거래소입니다: {self.exchange.code}")
+        if not self.price and self.exchange is not KRX:
+            raise ValueError("해외주식은 지정가 주문만 지원합니다.")
+
+    def request(self) -> dict:
+        """주문을 요청하는 (path, tr_id, body)"""
+        tr_id = order_tr_ids[self.exchange.code][self.side == "sell"]
+        if self.exchange is KRX:
+            return {
+                "path": "/uapi/domestic-stock/v1/trading/order-cash",
+                "tr_id": tr_id,
+                "body": {
+                    "CANO": KIS_CANO,
+                    "ACNT_PRDT_CD": KIS_ACNT_PRDT_CD,
+                    "PDNO": self.code,
+                    "ORD_DVSN": "00" if self.price else "01",  # 00: 지정가, 01: 시장가
+                    "ORD_QTY": str(int(self.quantity)),
+                    "ORD_UNPR": str(int(self.price)),
+                },
+            }
+        body = {
+            "CANO": KIS_CANO,
+            "ACNT_PRDT_CD": KIS_ACNT_PRDT_CD,
+            "OVRS_EXCG_CD": order_exchange_codes[self.exchange.code],
+            "PDNO": self.code,
+            "ORD_QTY": str(int(self.quantity)),
+            "OVRS_ORD_UNPR": f"{self.price:.4f}",
+            "ORD_SVR_DVSN_CD": "0",
+            "ORD_DVSN": "00",  # 지정가
+        }
+        if self.side == "sell":
+            body["SLL_TYPE"] = "00"
+        return {
+            "path": "/uapi/overseas-stock/v1/trading/order",
+            "tr_id": tr_id,
+            "body": body,
+        }
+
+
+@dataclass
+class OrderAck:
+    """
+    - 주문 접수 결과 / ok가 False이면 KIS가 주문을 거부한 것이며 message에 사유가 담깁니다.
+    - 시간은 모두 초 단위입니다.
+    """
+
+    order: Order
+    ok: bool
+    order_no: Optional[str]  # 주문번호(ODNO)
+    message: str
+    hash_latency: float  # 큐에 들어온 시점부터 hash key 발급까지 걸린 시간
+    latency: float  # 큐에 들어온 시점부터 접수 응답까지 걸린 시간
+
+
+class OrderQueue:
+    """
+    - 여러 주문을 hash key 발급 -> 주문 전송 2단계 파이프라인으로 동시에 처리합니다.
+        - 앞선 주문들이 전송되는 동안 뒤의 주문들의 hash key가 미리 발급됩니다.
+        - HTTP 호출 빈도는 kis.limit.limiter가 전역으로 제한하므로 두 단계를 합쳐도 KIS 제한을 넘지 않습니다.
+    - submit(order)은 바로 Future를 반환하며, 접수되면 OrderAck가 결과로 설정됩니다.
+      네트워크 오류 등으로 전송하지 못한 경우 Future에 예외가 설정됩니다. (주문은 재시도하지 않습니다.)
+    - with OrderQueue() as queue: 로 사용하면 블록이 끝날 때 모든 주문의 접수를 기다립니다.
+    """
+
+    def __init__(self, hash_workers: int = 4, submit_workers: int = 4):
+        self._hash_pool = ThreadPoolExecutor(
+            hash_workers, thread_name_prefix="OrderHash"
+        )
+        self._submit_pool = ThreadPoolExecutor(
+            submit_workers, thread_name_prefix="OrderSubmit"
+        )
+        self.lock = threading.Lock()
+        self.futures: List[Future] = []
+        self.acks: List[OrderAck] = []
+
+    def submit(self, order: Order) -> Future:
+        """주문을 큐에 넣고 OrderAck를 결과로 갖는 Future를 반환합니다."""
+        future = Future()
+        queued = time.perf_counter()
+        request = order.request()
+        stage = self._hash_pool.submit(auth.hash, request["body"])
+        stage.add_done_callback(
+            lambda hashed: self._submit_pool.submit(
+                self._send, order, request, hashed, queued, future
+            )
+        )
+        with self.lock:
+            self.futures.append(future)
+        return future
+
+    def submit_all(self, orders: Iterable[Order]) -> List[Future]:
+        """submit의 여러 주문 버전 / 입력 순서대로 Future 리스트를 반환합니다."""
+        return [self.submit(order) for order in orders]
+
+    def _send(
+        self,
+        order: Order,
+        request: dict,
+        hashed: Future,
+        queued: float,
+        future: Future,
+    ):
+        try:
+            hash_key = hashed.result()
+            hash_latency = time.perf_counter() - queued
+            res = client.post(
+                path=request["path"],
+                headers=auth.headers(request["tr_id"], custtype="P", hashkey=hash_key),
+                json=request["body"],
+            )
+        except Exception as error:
+            log.warning(f"[OrderQueue] 주문 전송 실패 {order}: {error!r}")
+            future.set_exception(error)
+            return
+        ack = OrderAck(
+            order=order,
+            ok=res.get("rt_cd") == "0",
+            order_no=(res.get("output") or {}).get("ODNO"),
+            message=res.get("msg1", ""),
+            hash_latency=hash_latency,
+            latency=time.perf_counter() - queued,
+        )
+        if not ack.ok:
+            log.warning(f"[OrderQueue] 주문 거부 {order}: {ack.message}")
+        with self.lock:
+            self.acks.append(ack)
+        future.set_result(ack)
+
+    def join(self, timeout: float = None) -> List[OrderAck]:
+        """지금까지 넣은 모든 주문이 처리될 때까지 기다리고 접수된 OrderAck 리스트를 반환합니다."""
+        with self.lock:
+            futures = list(self.futures)
+        for future in futures:
+            future.exception(timeout)  # 예외는 각 Future에서 확인합니다.
+        with self.lock:
+            return list(self.acks)
+
+    def report(self) -> dict:
+        """접수된 주문 수, 거부 수, 전송 실패 수와 주문별 지연 시간 통계(초)"""
+        with self.lock:
+            latency = np.array([ack.latency for ack in self.acks] or [0.0])
+            failed = sum(
+                future.done() and future.exception() is not None
+                for future in self.futures
+            )
+            return {
+                "submitted": len(self.futures),
+                "acked": len(self.acks),
+                "rejected": sum(not ack.ok for ack in self.acks),
+                "failed": failed,
+                "latency_p50": float(np.percentile(latency, 50)),
+                "latency_p95": float(np.percentile(latency, 95)),
+                "latency_max": float(latency.max()),
+            }
+
+    def close(self):
+        self.join()
+        self._hash_pool.shutdown()
+        self._submit_pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<kis.post.OrderQueue (submitted: {len(self.futures)}, acked: {len(self.acks)})>"
+
+
+def order(exchange: StockExchange, code: str, side: str, quantity: int, price=0):
+    """주문 하나를 전송하고 접수 결과(OrderAck)를 반환합니다."""
+    with OrderQueue(hash_workers=1, submit_workers=1) as queue:
+        return queue.submit(Order(exchange, code, side, quantity, price)).result()
@@ -0,0 +1,119 @@
+""" 여러 종목의 현재가를 동시에 조회하고 유지합니다. """
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+from kis.get import Stock
+from system.logger import log
+
+
+class QuoteBook:
+    """
+    - 여러 Stock의 현재가를 스레드 풀로 동시에 조회하여 배열에 보관합니다.
+    - prices[i], updated[i]: stocks[i]의 최근 체결가와 조회 시각(time.time()) / 조회 전에는 nan
+    - start()를 호출하면 interval(초)마다 백그라운드 스레드에서 refresh()를 반복합니다.
+    - on_change로 등록한 콜백은 가격이 바뀐 종목마다 callback(stock, old, new)로 호출됩니다.
+        - 콜백에서 발생한 예외는 로그로 남기고 다음 콜백을 호출합니다. (폴링 스레드는 멈추지 않습니다.)
+    """
+
+    def __init__(self, stocks: List[Stock], interval: float = 1.0, workers: int = 8):
+        self.stocks = list(stocks)
+        self.index = {
+            (stock.exchange.code, stock.code): i for i, stock in enumerate(self.stocks)
+        }
+        self.prices = np.full(len(self.stocks), np.nan)
+        self.updated = np.full(len(self.stocks), np.nan)
+        self.interval = interval
+        self.callbacks: List[Callable] = []
+
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def on_change(self, callback: Callable) -> Callable:
+        """가격 변경 콜백을 등록합니다. 데코레이터로 사용할 수 있습니다."""
+        self.callbacks.append(callback)
+        return callback
+
+    def _fetch(self, i: int) -> Tuple[int, float, float]:
+        price = self.stocks[i].current()
+        return i, price, time.time()
+
+    def refresh(self) -> int:
+        """모든 종목의 현재가를 한번 조회하고 가격이 바뀐 종목 수를 반환합니다."""
+        futures = [
+            self._executor.submit(self._fetch, i) for i in range(len(self.stocks))
+        ]
+        changed = []
+        for future in as_completed(futures):
+            try:
+                i, price, at = future.result()
+            except Exception as error:
+                log.warning(f"[QuoteBook] 현재가 조회 실패: {error!r}")
+                continue
+            if price is None:
+                continue
+            old = self.prices[i]
+            self.prices[i] = price
+            self.updated[i] = at
+            if old != price:  # 첫 조회(nan)도 변경으로 취급합니다.
+                changed.append((self.stocks[i], old, price))
+
+        for stock, old, new in changed:
+            for callback in self.callbacks:
+                try:
+                    callback(stock, old, new)
+                except Exception as error:
+                    name = getattr(callback, "__qualname__", repr(callback))
+                    log.error(
+                        f"[QuoteBook] {stock.code} 가격 변경 콜백({name}) 실패: {error!r}"
+                    )
+        return len(changed)
+
+    def staleness(self) -> np.ndarray:
+        """각 종목의 마지막 조회 이후 경과 시간(초) / 조회 전에는 nan"""
+        return time.time() - self.updated
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self.refresh()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def start(self):
+        """백그라운드 폴링을 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """백그라운드 폴링을 멈추고 진행 중인 조회가 끝날 때까지 기다립니다."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def __getitem__(self, key: Union[Stock, Tuple[str, str]]) -> float:
+        """Stock 또는 (거래소코드, 종목코드)로 최근 가격을 조회합니다."""
+        if isinstance(key, Stock):
+            key = (key.exchange.code, key.code)
+        return self.prices[self.index[key]]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        self._executor.shutdown()
+
+    def __len__(self) -> int:
+        return len(self.stocks)
+
+    def __repr__(self) -> str:
+        return f"<kis.quote.QuoteBook (symbols: {len(self.stocks)}, interval: {self.interval}s)>"
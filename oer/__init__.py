@@ -0,0 +1,3 @@
+""" 환율 (Open Exchange Rates) """
+
+from oer.get import *
@@ -1 +1,223 @@
-# 환율!!
+""" 환율을 불러오고 여러 통화의 가격을 하나의 기준 통화로 변환합니다. """
+
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from pathlib import Path
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from calc.math import StockAnalyzer
+
+OER_APP_ID = os.environ.get("OER_APP_ID")
+# FileProvider가 읽는 환율 파일 디렉토리
+OER_DIR = Path(os.environ.get("OER_DIR", Path.home() / ".cache" / "ivot" / "oer"))
+
+
+class RateProvider(ABC):
+    """
+    - 환율 공급자 인터페이스 / historical을 구현합니다.
+    - historical(day): day의 환율 {"USD": 1.0, "KRW": 1300.0, ...} (1 USD당 각 통화의 양)
+        - day의 환율이 없으면 가장 가까운 이전 날짜의 환율을 반환하고, 그것도 없으면 LookupError
+    """
+
+    @abstractmethod
+    def historical(self, day: date) -> Dict[str, float]:
+        pass
+
+
+class FileProvider(RateProvider):
+    """
+    - root/YYYY-MM-DD.json 파일들에서 환율을 읽습니다. (네트워크 없이 사용하는 로컬 공급자)
+    - 파일 형식은 Open Exchange Rates의 historical 응답과 같습니다. {"base": "USD", "rates": {...}}
+    - 휴일처럼 파일이 없는 날짜는 가장 가까운 이전 날짜의 파일을 사용합니다.
+    - 실행 중에 추가되는 파일도 사용하도록 요청마다 파일 목록을 다시 읽습니다.
+      (RateTable이 날짜별로 ttl 동안 캐싱하므로 자주 호출되지 않습니다.)
+    """
+
+    def __init__(self, root: Path = OER_DIR):
+        self.root = Path(root)
+
+    def days(self) -> list:
+        """정렬된 파일 날짜 목록"""
+        return sorted(
+            date.fromisoformat(path.stem) for path in self.root.glob("*.json")
+        )
+
+    def historical(self, day: date) -> Dict[str, float]:
+        days = self.days()
+        if not (i := bisect_right(days, day)):
+            raise LookupError(f"{day} 이전의 환율 파일이 없습니다: {self.root}")
+        data = json.loads((self.root / f"{days[i - 1]}.json").read_text())
+        return _usd_rates(data)
+
+
+class OpenExchangeRates(RateProvider):
+    """openexchangerates.org의 historical API / OER_APP_ID 환경변수가 필요합니다."""
+
+    url = "https://openexchangerates.org/api/historical/{day}.json"
+
+    def __init__(self, app_id: str = OER_APP_ID, timeout: float = 10):
+        self.app_id = app_id
+        self.session = requests.Session()
+        self.timeout = timeout
+
+    def historical(self, day: date) -> Dict[str, float]:
+        res = self.session.get(
+            self.url.format(day=day.isoformat()),
+            params={"app_id": self.app_id},
+            timeout=self.timeout,
+        )
+        if res.status_code == 400:  # 아직 데이터가 없는 날짜
+            raise LookupError(f"{day}의 환율이 없습니다.")
+        res.raise_for_status()
+        return _usd_rates(res.json())
+
+
+def _usd_rates(data: dict) -> Dict[str, float]:
+    """Open Exchange Rates 형식의 응답을 1 USD당 각 통화의 양으로 변환합니다."""
+    base = data.get("base", "USD")
+    rates = {base: 1.0} | {
+        currency: float(rate) for currency, rate in data["rates"].items()
+    }
+    usd = rates["USD"]
+    return {currency: rate / usd for currency, rate in rates.items()}
+
+
+class RateTable:
+    """
+    - 날짜별 환율을 캐싱합니다. 같은 날짜는 ttl(초) 동안 공급자에게 다시 요청하지 않습니다.
+    - 캐시된 날짜가 max_days를 넘으면 가장 오래 사용하지 않은 날짜부터 버립니다.
+    - factors(dates, currency, base): 날짜 배열에 맞춘 환산 계수 배열 / 날짜마다 한번씩만 조회합니다.
+    """
+
+    def __init__(
+        self, provider: RateProvider, ttl: float = 6 * 3600, max_days: int = 4096
+    ):
+        self.provider = provider
+        self.ttl = ttl
+        self.max_days = max_days
+        self.lock = threading.Lock()
+        self._rates: "OrderedDict[date, Tuple[float, Dict[str, float]]]" = OrderedDict()
+
+    def rates(self, day: date) -> Dict[str, float]:
+        """day의 환율 (1 USD당 각 통화의 양)"""
+        if isinstance(day, datetime):
+            day = day.date()
+        with self.lock:
+            if (cached := self._rates.get(day)) and cached[0] > time.monotonic():
+                self._rates.move_to_end(day)
+                return cached[1]
+
+        rates = self.provider.historical(day)
+        with self.lock:
+            self._rates[day] = (time.monotonic() + self.ttl, rates)
+            self._rates.move_to_end(day)
+            while len(self._rates) > self.max_days:
+                self._rates.popitem(last=False)
+        return rates
+
+    def rate(self, day: date, currency: str, base: str = "USD") -> float:
+        """day에 currency 1단위의 base 통화 가치"""
+        rates = self.rates(day)
+        return rates[base] / rates[currency]
+
+    def factors(
+        self, dates: np.ndarray, currency: str, base: str = "USD"
+    ) -> np.ndarray:
+        """
+        - dates의 각 날짜에 currency -> base 환산 계수를 담은 배열
+        - 겹치는 날짜가 많으므로 고유한 날짜들만 조회한 뒤 원래 순서로 펼칩니다.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if currency == base:
+            return np.ones(len(dates))
+        unique, inverse = np.unique(dates, return_inverse=True)
+        factors = np.array(
+            [self.rate(day, currency, base) for day in unique.astype(date)]
+        )
+        return factors[inverse]
+
+    def clear(self):
+        with self.lock:
+            self._rates.clear()
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def __repr__(self) -> str:
+        return f"<oer.get.RateTable {type(self.provider).__name__} (days: {len(self)})>"
+
+
+rate_table = RateTable(OpenExchangeRates() if OER_APP_ID else FileProvider())
+
+
+def currency_of(analyzer: StockAnalyzer) -> str:
+    """StockAnalyzer의 거래소 통화 (kis.get.StockExchange.currency)"""
+    if (currency := getattr(analyzer.exchange, "currency", None)) is None:
+        raise ValueError(f"거래소의 통화를 알 수 없습니다: {analyzer.exchange}")
+    return currency
+
+
+def _scale(analyzer: StockAnalyzer, factors: np.ndarray) -> StockAnalyzer:
+    columns = {
+        key: None if (values := getattr(analyzer, key)) is None else values * factors
+        for key in ("price", "low", "high", "open", "close", "tamt")
+    }
+    return StockAnalyzer(
+        code=analyzer.code,
+        exchange=analyzer.exchange,
+        date=analyzer.date,
+        tvol=analyzer.tvol,
+        **columns,
+    )
+
+
+def normalize(
+    analyzer: StockAnalyzer, base: str = "USD", table: Optional[RateTable] = None
+) -> StockAnalyzer:
+    """
+    - 가격(price, low, high, open, close)과 거래대금(tamt)을 base 통화로 환산한 StockAnalyzer
+    - 각 날짜의 환율을 곱합니다. 거래량(tvol)은 그대로입니다.
+    - 이미 base 통화인 경우 analyzer를 그대로 반환합니다.
+    """
+    currency = currency_of(analyzer)
+    if currency == base:
+        return analyzer
+    table = rate_table if table is None else table
+    return _scale(analyzer, table.factors(analyzer.date, currency, base))
+
+
+def normalize_all(
+    analyzers: List[StockAnalyzer], base: str = "USD", table: Optional[RateTable] = None
+) -> List[StockAnalyzer]:
+    """
+    - 여러 종목을 한번에 normalize합니다.
+    - 통화마다 모든 종목의 날짜를 합친 달력의 환산 계수를 한번만 만들고,
+      각 종목은 이진 탐색으로 자기 날짜의 계수를 가져옵니다.
+    """
+    table = rate_table if table is None else table
+    currencies = [currency_of(analyzer) for analyzer in analyzers]
+    calendars = {}
+    for currency in set(currencies) - {base}:
+        dates = [a.date for a, c in zip(analyzers, currencies) if c == currency]
+        calendar = np.unique(np.concatenate(dates))
+        calendars[currency] = (calendar, table.factors(calendar, currency, base))
+
+    normalized = []
+    for analyzer, currency in zip(analyzers, currencies):
+        if currency == base:
+            normalized.append(analyzer)
+            continue
+        calendar, factors = calendars[currency]
+        normalized.append(
+            _scale(analyzer, factors[np.searchsorted(calendar, analyzer.date)])
+        )
+    return normalized
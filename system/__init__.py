@@ -1 +1,15 @@
-from system.logger import *
+import importlib
+
+from system.metrics import *
+
+
+def __getattr__(name: str):
+    """
+    - system.logger는 처음 사용할 때 불러옵니다.
+    - system.metrics만 사용하는 모듈(calc)을 import해도 로그 핸들러가 만들어지지 않습니다.
+    """
+    logger = importlib.import_module("system.logger")
+    try:
+        return getattr(logger, name)
+    except AttributeError:
+        raise AttributeError(f"module 'system' has no attribute '{name}'") from None
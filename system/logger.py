@@ -1,55 +1,186 @@
+import os
+import time
+import queue
+import atexit
 import platform
+import threading
+import multiprocessing
 import psutil
 import traceback
 import logging
 import logging.config
 from functools import wraps
 from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime
+from typing import Tuple
 
+from system.metrics import metrics
 
-class LogHandler(logging.NullHandler):
-    def __init__(self):
-        super().__init__()
-        self.filename = "debug.log"
-        self.today = datetime.now()
-        with open(self.filename, "w") as file:
-            file.write(
-                f"Platform: {platform.platform()}\n"
-                f"======= 시작: {self.today.year}년 {self.today.month}월 {self.today.day}일 =======\n\n"
-            )
 
-    def handle(self, record):
-        print(f"[{record.processName}][{record.levelname}] {self.format(record)}")
+def system_status() -> str:
+    """메모리, 디스크 사용량"""
+    memory = psutil.virtual_memory()
+    memory_used = memory.total - memory.available
+    memory_percent = (memory_used / memory.total) * 100
 
-        memory = psutil.virtual_memory()
-        memory_used = memory.total - memory.available
-        memory_percent = (memory_used / memory.total) * 100
+    disk = psutil.disk_usage("/")
+    disk_used = disk.total - disk.free
+    disk_percent = (disk_used / disk.total) * 100
 
-        disk = psutil.disk_usage("/")
-        disk_used = disk.total - disk.free
-        disk_percent = (disk_used / disk.total) * 100
+    memory_percent = f"{memory_percent:.0f}%"
+    disk_percent = f"{disk_percent:.0f}%"
+    memory_gb = f"{memory_used * 1e-9:.0f}GB"
+    disk_gb = f"{disk_used * 1e-9:.0f}GB"
 
-        memory_percent = f"{memory_percent:.0f}%"
-        disk_percent = f"{disk_percent:.0f}%"
-        memory_gb = f"{memory_used * 1e-9:.0f}GB"
-        disk_gb = f"{disk_used * 1e-9:.0f}GB"
+    return f"[메모리: {memory_gb}({memory_percent})][디스크: {disk_gb}({disk_percent})]"
 
-        system_status = (
-            f"[메모리: {memory_gb}({memory_percent})][디스크: {disk_gb}({disk_percent})]"
-        )
 
-        now = datetime.now()
-        time = f"[{now.hour}시 {now.minute}분 {now.second}초]"
+def is_main_process() -> bool:
+    """
+    - 멀티프로세싱 워커가 아닌 메인 프로세스인지 여부
+    - spawn, forkserver 워커는 부모 프로세스가 설정되기 전에 __main__ 모듈을 다시 import하므로
+      그동안 설정되는 _inheriting도 확인합니다.
+    """
+    process = multiprocessing.current_process()
+    return multiprocessing.parent_process() is None and not getattr(
+        process, "_inheriting", False
+    )
 
-        content = f"[{record.processName}][{record.levelname}][{record.module}({record.funcName})]{time}{system_status}\n{self.format(record)}"
-        with open(self.filename, "a") as file:
-            if self.today.day != now.day:
-                self.today = now
-                file.write(
-                    f"\n======= {self.today.year}년 {self.today.month}월 {self.today.day}일 =======\n\n"
-                )
-            file.write(content + "\n")
+
+class LogWriter(threading.Thread):
+    """
+    - LogHandler의 큐에서 레코드를 꺼내 콘솔과 로그 파일에 기록하는 백그라운드 스레드입니다.
+    - 큐에 쌓인 레코드를 최대 batch_size개씩 모아서 기록하고 한번만 flush합니다.
+    - 시스템 상태(메모리, 디스크)는 레코드마다 조회하지 않고 status_interval초마다 갱신합니다.
+    - 날짜가 바뀌면 로그 파일을 debug.YYYY-MM-DD.log로 옮기고 새 파일에 기록합니다.
+    - handler.filename이 None이면(메인 프로세스가 아닌 경우) 콘솔에만 출력합니다.
+    """
+
+    def __init__(
+        self,
+        handler: "LogHandler",
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        status_interval: float = 5.0,
+    ):
+        super().__init__(name="LogWriter", daemon=True)
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.status_interval = status_interval
+        self.status = system_status()
+        self.status_time = time.monotonic()
+        self.today = datetime.now().date()
+        self.file = self._open()
+
+    def _open(self, title: str = "시작: "):
+        """
+        - 새 로그 파일에 머리말을 쓰고 이어쓰기("a") 모드로 엽니다.
+        - 다른 프로세스가 파일을 비워도 항상 파일 끝에 기록되므로 NUL로 채워진 구간이 생기지 않습니다.
+        """
+        if self.handler.filename is None:
+            return None
+        with open(self.handler.filename, "w", encoding="utf-8") as file:
+            file.write(
+                f"Platform: {platform.platform()}\n"
+                f"======= {title}{self.today.year}년 {self.today.month}월 {self.today.day}일 =======\n\n"
+            )
+        return open(self.handler.filename, "a", encoding="utf-8")
+
+    def _rotate(self, day):
+        """지난 날짜의 로그 파일을 보관하고 새 로그 파일을 엽니다."""
+        yesterday, self.today = self.today, day
+        if self.file is None:
+            return
+        self.file.close()
+        path = Path(self.handler.filename)
+        os.replace(path, path.with_name(f"{path.stem}.{yesterday}{path.suffix}"))
+        self.file = self._open(title="")
+
+    def _line(self, record: logging.LogRecord) -> Tuple[str, str]:
+        """(콘솔 출력, 파일 기록) 문자열"""
+        message = self.handler.format(record)
+        created = datetime.fromtimestamp(record.created)
+        time_ = f"[{created.hour}시 {created.minute}분 {created.second}초]"
+        console = f"[{record.processName}][{record.levelname}] {message}"
+        content = f"[{record.processName}][{record.levelname}][{record.module}({record.funcName})]{time_}{self.status}\n{message}"
+        return console, content
+
+    def _write(self, console: list, content: list):
+        """모은 줄들을 콘솔과 로그 파일에 기록하고 비웁니다."""
+        if console:
+            print("\n".join(console))
+        if content and self.file:
+            self.file.write("\n".join(content) + "\n")
+            self.file.flush()
+        console.clear()
+        content.clear()
+
+    def run(self):
+        stop = False
+        while not stop:
+            try:
+                batch = [self.handler.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.handler.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if time.monotonic() - self.status_time > self.status_interval:
+                self.status = system_status()
+                self.status_time = time.monotonic()
+
+            console, content = [], []
+            for record in batch:
+                if record is None:  # 종료 신호
+                    stop = True
+                    continue
+                # 여러 스레드의 레코드는 자정 무렵 순서가 조금 뒤바뀔 수 있으므로 날짜가 앞으로 갈 때만 교체합니다.
+                # 교체 전에 모은 줄들은 지난 날짜의 파일에 먼저 기록합니다.
+                if (day := datetime.fromtimestamp(record.created).date()) > self.today:
+                    self._write(console, content)
+                    self._rotate(day)
+                try:
+                    line = self._line(record)
+                except Exception:
+                    self.handler.handleError(record)
+                    continue
+                console.append(line[0])
+                content.append(line[1])
+
+            self._write(console, content)
+        if self.file:
+            self.file.close()
+
+
+class LogHandler(logging.Handler):
+    """
+    - 로그 레코드를 큐에 넣기만 하므로 호출한 스레드에서는 포멧팅과 파일 I/O가 일어나지 않습니다.
+    - 실제 기록은 LogWriter 스레드가 담당하며, 프로그램 종료 시 남은 레코드를 모두 기록합니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # 로그 파일은 메인 프로세스만 엽니다. (워커 프로세스가 부모의 로그 파일을 덮어쓰지 않도록)
+        self.filename = "debug.log" if is_main_process() else None
+        self.queue = queue.SimpleQueue()
+        self.writer = LogWriter(self)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def emit(self, record):
+        self.queue.put(record)
+
+    def close(self):
+        """남은 레코드를 모두 기록하고 LogWriter 스레드를 종료합니다."""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        super().close()
 
 
 log = logging.getLogger("logger")
@@ -62,26 +193,31 @@ log.addHandler(log_handler)
 
 
 @contextmanager
-def exception_handler(comment: str):
+def exception_handler(comment: str, metric: str = None):
     """
     - 컨텍스트 안에서 발생하는 에러를 헨들링합니다.
     - (comment): 컨텍스트에 대한 한줄 설명
+    - (metric): 실행 시간과 에러 여부를 기록할 지표 이름 / default=comment (system.metrics 참고)
     """
     error_comment = comment + " 실행 중 에러 발생"
-    try:
-        log.debug(f"{comment} (start)")
-        yield
-        log.debug(f"{comment} (done)")
-    except Exception as fatal_error:
-        error_name = fatal_error.__class__.__name__
-        log.critical(f"{error_comment}\n{error_name}\n{traceback.format_exc()}")
-        raise fatal_error
-    finally:
-        pass
+    with metrics.measure(metric or comment):
+        try:
+            log.debug(f"{comment} (start)")
+            yield
+            log.debug(f"{comment} (done)")
+        except Exception as fatal_error:
+            error_name = fatal_error.__class__.__name__
+            log.critical(f"{error_comment}\n{error_name}\n{traceback.format_exc()}")
+            raise fatal_error
+        finally:
+            pass
 
 
 class ExceptionHandler:
-    """callable 객체 안에서 발생하는 에러를 헨들링합니다."""
+    """
+    - callable 객체 안에서 발생하는 에러를 헨들링합니다.
+    - 호출 횟수, 지연 시간, 에러율은 함수 이름(__qualname__)으로 기록됩니다.
+    """
 
     def __init__(self, comment: str):
         self.comment = comment
@@ -91,7 +227,7 @@ class ExceptionHandler:
         def wrapper(*args, comment="", **kwargs):
             comment = f"({comment})" if comment else ""
             log_content = f"[함수: {func.__qualname__}{comment}] {self.comment}"
-            with exception_handler(comment=log_content):
+            with exception_handler(comment=log_content, metric=func.__qualname__):
                 result = func(*args, **kwargs)
             return result
 
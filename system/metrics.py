@@ -0,0 +1,160 @@
+""" 함수 호출과 HTTP 요청의 성능 지표를 수집합니다. """
+
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+from bisect import bisect_left
+from functools import wraps
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+# 지연 시간 히스토그램 구간의 상한(초) / 10us부터 약 100초까지 1.25배씩 증가합니다.
+BUCKETS = [1e-5 * 1.25**i for i in range(73)] + [float("inf")]
+
+
+class Metric:
+    """하나의 지표(함수, HTTP 엔드포인트 등)의 누적 통계"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0  # 누적 소요 시간(초)
+        self.max = 0.0
+        self.bytes = 0  # 누적 응답 크기 (HTTP)
+        self.retries = 0  # 누적 재시도 횟수 (HTTP)
+        self.histogram = [0] * len(BUCKETS)
+
+    def record(
+        self, elapsed: float, error: bool = False, size: int = 0, retries: int = 0
+    ):
+        self.count += 1
+        self.errors += error
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.bytes += size
+        self.retries += retries
+        self.histogram[bisect_left(BUCKETS, elapsed)] += 1
+
+    def percentile(self, q: float) -> float:
+        """히스토그램으로 추정한 q 분위수(초) / 해당 구간의 상한을 반환합니다."""
+        if not self.count:
+            return 0.0
+        rank, cumulative = q * self.count, 0
+        for bound, count in zip(BUCKETS, self.histogram):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "total": self.total,
+            "bytes": self.bytes,
+            "retries": self.retries,
+        }
+
+
+class Metrics:
+    """
+    - 이름별 Metric을 모아서 관리합니다. 모든 메서드는 스레드 안전합니다.
+    - snapshot(): 현재까지의 통계를 dict로 반환합니다.
+    - start_dump(path, interval): interval초마다 통계를 path에 JSON으로 기록합니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Metric] = {}
+        self._dump_stop = None
+
+    def record(self, name: str, elapsed: float, error: bool = False, **extra):
+        """extra: size(응답 바이트 수), retries(재시도 횟수)"""
+        with self.lock:
+            if (metric := self.metrics.get(name)) is None:
+                metric = self.metrics[name] = Metric()
+            metric.record(elapsed, error, **extra)
+
+    @contextmanager
+    def measure(self, name: str):
+        """컨텍스트 안의 실행 시간과 에러 여부를 기록합니다."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error)
+
+    def timed(self, name: str):
+        """함수의 실행 시간과 에러 여부를 기록하는 데코레이터"""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.measure(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self.lock:
+            return {name: metric.summary() for name, metric in self.metrics.items()}
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def dump(self, path: Path):
+        """
+        - 현재 통계를 JSON 파일로 기록합니다.
+        - 임시 파일 이름은 기록할 때마다 달라지므로 주기적 기록과 종료 시 기록이 겹쳐도 됩니다.
+        """
+        path = Path(path)
+        content = json.dumps(
+            {"time": time.time(), "metrics": self.snapshot()}, indent=2
+        )
+        fd, temp = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(content)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def start_dump(self, path: Path = "metrics.json", interval: float = 60.0):
+        """interval초마다, 그리고 프로그램 종료 시 통계를 path에 기록합니다."""
+        self.stop_dump()
+        stop = self._dump_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.dump(path)
+
+        threading.Thread(target=run, name="MetricsDump", daemon=True).start()
+        atexit.register(self.dump, path)
+
+    def stop_dump(self):
+        if self._dump_stop:
+            self._dump_stop.set()
+            atexit.unregister(self.dump)
+
+
+metrics = Metrics()